@@ -2,18 +2,34 @@
 
 import os
 import sys
+from dataclasses import replace
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from PyQt6.QtCore import Qt, QtMsgType, qInstallMessageHandler
-from PyQt6.QtGui import QIcon
-from PyQt6.QtWidgets import QApplication
-
-from . import __version__
 from .config import get_config_manager, save_config
-from .database import init_database
-from .ui.main_window import MainWindow
-from .ui.theme import AbletonTheme
 from .utils.logging import get_logger, setup_logging
-from .utils.paths import get_resources_path
+
+# Qt, the UI tree and the database layer are imported inside the methods that
+# need them, so importing this module stays cheap.
+if TYPE_CHECKING:
+    from .ui.main_window import MainWindow
+
+# Application icon candidates relative to the resources directory, in order of preference
+if sys.platform == "win32":
+    _ICON_CANDIDATES = (("icons", "AProject.ico"), ("images", "als-icon.png"))
+else:
+    # macOS/Linux - prefer PNG (works on all platforms)
+    _ICON_CANDIDATES = (("images", "als-icon.png"), ("icons", "AProject.ico"))
+
+
+@lru_cache(maxsize=1)
+def _app_icon_paths() -> tuple[Path, ...]:
+    """Resolve the application icon candidates to absolute paths (once per process)."""
+    from .utils.paths import get_resources_path
+
+    resources = get_resources_path()
+    return tuple(resources.joinpath(*parts) for parts in _ICON_CANDIDATES)
 
 
 class AbletonHubApp:
@@ -25,18 +41,29 @@ class AbletonHubApp:
         Args:
             argv: Command line arguments.
         """
-        # Enable high DPI scaling
-        if hasattr(Qt.ApplicationAttribute, "AA_EnableHighDpiScaling"):
-            QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
-        if hasattr(Qt.ApplicationAttribute, "AA_UseHighDpiPixmaps"):
-            QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
+        from PyQt6.QtCore import QThreadPool, QTimer
+        from PyQt6.QtWidgets import QApplication
+
+        from . import __version__
 
+        # High DPI scaling is always enabled in Qt6 (the Qt5 AA_EnableHighDpiScaling and
+        # AA_UseHighDpiPixmaps attributes no longer exist), so no attributes are set here
         self.app = QApplication(argv)
         self.app.setApplicationName("Ableton Hub")
         self.app.setApplicationVersion(__version__)
         self.app.setOrganizationName("AbletonHub")
         self.app.setOrganizationDomain("abletonhub.local")
 
+        # Main window is created in run(); cleanup state is tracked for _on_quit
+        self.main_window: MainWindow | None = None
+        self._cleanup_done = False
+
+        # Coalesces config saves requested during the session into a single write
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(save_config)
+
         # Load configuration BEFORE setting up logging (needed for logging config)
         self.config_manager = get_config_manager()
         self.config = self.config_manager.config
@@ -47,16 +74,8 @@ class AbletonHubApp:
         # Setup logging with config
         # If dev mode and config level is ERROR (default), override to DEBUG
         if is_dev_mode and self.config.logging.level == "ERROR":
-            # Create a temporary config with DEBUG level for dev mode
-            from .config import LoggingConfig
-
-            dev_logging_config = LoggingConfig(
-                enabled=self.config.logging.enabled,
-                level="DEBUG",  # Override to DEBUG in dev mode
-                log_dir=self.config.logging.log_dir,
-                max_bytes=self.config.logging.max_bytes,
-                backup_count=self.config.logging.backup_count,
-            )
+            # Copy of the saved config with the level overridden to DEBUG for dev mode
+            dev_logging_config = replace(self.config.logging, level="DEBUG")
             setup_logging(config=dev_logging_config)
         else:
             setup_logging(config=self.config.logging)
@@ -69,35 +88,74 @@ class AbletonHubApp:
         # Install global exception handler
         self._install_exception_handler()
 
+        # Initialize the database on a worker thread while the theme and icon are set
+        # up here; run() waits for it before building the main window
+        self._db_init_error: Exception | None = None
+        self._startup_pool = QThreadPool()
+        self._startup_pool.setMaxThreadCount(1)
+        self._startup_pool.start(self._init_database)
+
+        from .ui.theme import AbletonTheme
+
+        # Apply theme (legacy values are normalized when the config is loaded)
+        self.theme = AbletonTheme(self.config.ui.theme)
+        self.theme.apply(self.app)
+
         # Set application icon
         self._set_application_icon()
 
+    def _init_database(self) -> None:
+        """Create and migrate the database (runs on the startup thread pool)."""
+        from .database import init_database
+
+        try:
+            init_database()
+        except Exception as e:
+            # Re-raised on the main thread by _wait_for_database()
+            self._db_init_error = e
+
+    def _wait_for_database(self) -> None:
+        """Block until background database initialization has finished.
+
+        Raises:
+            Exception: Whatever init_database() raised on the worker thread.
+        """
+        self._startup_pool.waitForDone()
+        if self._db_init_error is not None:
+            error, self._db_init_error = self._db_init_error, None
+            raise error
+
     def _install_qt_message_handler(self) -> None:
         """Install a Qt message handler that routes messages through Python logging."""
-        qt_logger = get_logger("PyQt6")
+        from PyQt6.QtCore import QLoggingCategory, QtMsgType, qInstallMessageHandler
 
-        def qt_message_handler(msg_type, context, message):
-            """Route Qt messages through Python logging."""
-            # Suppress QtDebugMsg (0) and QtInfoMsg (4) messages unless in dev mode
-            is_dev_mode = __debug__ or os.getenv("ABLETON_HUB_DEBUG") == "1"
+        qt_logger = get_logger("PyQt6")
 
-            if msg_type == QtMsgType.QtDebugMsg:
-                if is_dev_mode:
-                    qt_logger.debug(f"Qt Debug: {message}")
-                return
+        # Evaluated once - Qt can emit thousands of messages per session
+        is_dev_mode = __debug__ or os.getenv("ABLETON_HUB_DEBUG") == "1"
 
-            if msg_type == QtMsgType.QtInfoMsg:
-                if is_dev_mode:
-                    qt_logger.info(f"Qt Info: {message}")
-                return
+        # Route warnings and critical errors through Python logging
+        handlers = {
+            QtMsgType.QtWarningMsg: ("Qt Warning: %s", qt_logger.warning),
+            QtMsgType.QtCriticalMsg: ("Qt Critical: %s", qt_logger.error),
+            QtMsgType.QtFatalMsg: ("Qt Fatal: %s", qt_logger.critical),
+        }
+        # QtDebugMsg and QtInfoMsg are suppressed unless in dev mode
+        if is_dev_mode:
+            handlers[QtMsgType.QtDebugMsg] = ("Qt Debug: %s", qt_logger.debug)
+            handlers[QtMsgType.QtInfoMsg] = ("Qt Info: %s", qt_logger.info)
+        else:
+            # Disable them in Qt's logging categories too, so Qt drops them in C++
+            # instead of calling into Python for each one (QT_LOGGING_RULES still wins)
+            QLoggingCategory.setFilterRules("*.debug=false\n*.info=false")
 
-            # Route warnings and critical errors through Python logging
-            if msg_type == QtMsgType.QtWarningMsg:
-                qt_logger.warning(f"Qt Warning: {message}")
-            elif msg_type == QtMsgType.QtCriticalMsg:
-                qt_logger.error(f"Qt Critical: {message}")
-            elif msg_type == QtMsgType.QtFatalMsg:
-                qt_logger.critical(f"Qt Fatal: {message}")
+        def qt_message_handler(msg_type, context, message):
+            """Route Qt messages through Python logging."""
+            handler = handlers.get(msg_type)
+            if handler is not None:
+                # Lazy %-formatting: the logger skips formatting for disabled levels
+                fmt, log = handler
+                log(fmt, message)
 
         qInstallMessageHandler(qt_message_handler)
 
@@ -117,7 +175,7 @@ class AbletonHubApp:
 
             # Also show user-friendly message if possible
             try:
-                if hasattr(self, "app") and self.app:
+                if self.app:
                     import traceback
 
                     from PyQt6.QtWidgets import QMessageBox
@@ -140,26 +198,17 @@ class AbletonHubApp:
 
         sys.excepthook = exception_handler
 
-        # Initialize database
-        init_database()
-
-        # Apply theme (from config or default to orange)
-        theme_name = getattr(self.config.ui, "theme", "orange")
-        if theme_name == "dark":  # Legacy support
-            theme_name = "orange"
-        self.theme = AbletonTheme(theme_name)
-        self.theme.apply(self.app)
-
-        # Create main window
-        self.main_window: MainWindow | None = None
-        self._cleanup_done = False
-
     def run(self) -> int:
         """Run the application event loop.
 
         Returns:
             Exit code from the application.
         """
+        from .ui.main_window import MainWindow
+
+        # The main window queries the database as soon as it is built
+        self._wait_for_database()
+
         # Create and show main window
         self.main_window = MainWindow(self.config, self.theme)
 
@@ -171,7 +220,7 @@ class AbletonHubApp:
         # Mark first run as complete
         if self.config.first_run:
             self.config.first_run = False
-            save_config()
+            self._schedule_config_save()
 
         # Connect cleanup on exit
         self.app.aboutToQuit.connect(self._on_quit)
@@ -211,6 +260,7 @@ class AbletonHubApp:
             return
 
         wc = self.config.window
+        before = self._window_snapshot()
 
         # Save maximized state
         wc.maximized = self.main_window.isMaximized()
@@ -228,12 +278,31 @@ class AbletonHubApp:
             wc.sidebar_width = self.main_window.sidebar.width()
             wc.sidebar_collapsed = self.main_window.sidebar.isHidden()
 
-        save_config()
+        # Nothing to write when the user didn't move, resize or toggle anything
+        if self._window_snapshot() != before:
+            self._schedule_config_save()
+
+    def _window_snapshot(self) -> tuple:
+        """Return the persisted window state fields as a comparable tuple."""
+        wc = self.config.window
+        return (
+            wc.maximized,
+            wc.width,
+            wc.height,
+            wc.x,
+            wc.y,
+            wc.sidebar_width,
+            wc.sidebar_collapsed,
+        )
+
+    def _schedule_config_save(self) -> None:
+        """Request a config save; calls within 500ms are batched into one write."""
+        self._save_timer.start()
 
     def _on_quit(self) -> None:
         """Handle application quit - save state and cleanup."""
         # Only run cleanup once
-        if hasattr(self, "_cleanup_done") and self._cleanup_done:
+        if self._cleanup_done:
             return
 
         self._cleanup_done = True
@@ -243,6 +312,13 @@ class AbletonHubApp:
         except Exception:
             pass  # Ignore errors during shutdown
 
+        # The event loop is stopping, so flush any pending save now
+        self._save_timer.stop()
+        try:
+            save_config()
+        except Exception:
+            pass  # Ignore errors during shutdown
+
         # Stop any background services
         if self.main_window:
             try:
@@ -254,37 +330,37 @@ class AbletonHubApp:
         try:
             from .database import close_database
 
+            self._startup_pool.waitForDone()
+
             close_database()
         except Exception:
             pass  # Ignore errors closing database
 
     def _set_application_icon(self) -> None:
         """Set the application icon from resources."""
+        from PyQt6.QtGui import QIcon
+
+        # QIcon.isNull() already reports missing files, so no exists() stat is done first
         try:
-            import sys
-
-            resources = get_resources_path()
-
-            # Try icons in order of preference (PNG works on all platforms)
-            if sys.platform == "win32":
-                icon_paths = [
-                    resources / "icons" / "AProject.ico",
-                    resources / "images" / "als-icon.png",
-                ]
-            else:
-                # macOS/Linux - prefer PNG
-                icon_paths = [
-                    resources / "images" / "als-icon.png",
-                    resources / "icons" / "AProject.ico",
-                ]
-
-            for icon_path in icon_paths:
-                if icon_path.exists():
-                    icon = QIcon(str(icon_path))
-                    if not icon.isNull():
-                        self.app.setWindowIcon(icon)
-                        self.logger.info(f"Set application icon from: {icon_path}")
-                        return
+            ui_config = self.config.ui
+
+            # Fast path: reuse the icon that loaded last time
+            cached_path = ui_config.cached_icon_path
+            if cached_path:
+                icon = QIcon(cached_path)
+                if not icon.isNull():
+                    self.app.setWindowIcon(icon)
+                    self.logger.info(f"Set application icon from: {cached_path}")
+                    return
+
+            for icon_path in _app_icon_paths():
+                icon = QIcon(str(icon_path))
+                if not icon.isNull():
+                    self.app.setWindowIcon(icon)
+                    self.logger.info(f"Set application icon from: {icon_path}")
+                    ui_config.cached_icon_path = str(icon_path)
+                    self._schedule_config_save()
+                    return
 
             self.logger.warning("No valid application icon found")
         except Exception as e:
@@ -1,15 +1,34 @@
 """Configuration manager for Ableton Hub."""
 
 import json
-from dataclasses import asdict, dataclass, field
+import os
+from dataclasses import dataclass, field, fields
+from functools import cache
 from pathlib import Path
 from typing import Any
 
 from .utils.logging import get_logger
 from .utils.paths import get_config_path
 
+try:
+    import orjson
 
-@dataclass
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Shared, immutable defaults; each config instance gets its own list copy
+_DEFAULT_EXCLUDE_PATTERNS: tuple[str, ...] = (
+    "**/Backup/**",
+    "**/Ableton Project Info/**",
+    "**/.git/**",
+    "**/node_modules/**",
+)
+_DEFAULT_EXPORT_FORMATS: tuple[str, ...] = (".wav", ".mp3", ".flac", ".aiff", ".aif")
+
+
+@dataclass(slots=True)
 class WindowConfig:
     """Window geometry and state configuration."""
 
@@ -22,37 +41,28 @@ class WindowConfig:
     sidebar_collapsed: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanConfig:
     """File scanning configuration."""
 
     recursive_depth: int = 10
     auto_scan_on_startup: bool = False  # Changed to False - scan only on button press
     scan_frequency_hours: int = 24
-    exclude_patterns: list[str] = field(
-        default_factory=lambda: [
-            "**/Backup/**",
-            "**/Ableton Project Info/**",
-            "**/.git/**",
-            "**/node_modules/**",
-        ]
-    )
+    exclude_patterns: list[str] = field(default_factory=lambda: list(_DEFAULT_EXCLUDE_PATTERNS))
     include_hidden: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ExportConfig:
     """Export tracking configuration."""
 
     export_folders: list[str] = field(default_factory=list)
     auto_detect_exports: bool = True
-    export_formats: list[str] = field(
-        default_factory=lambda: [".wav", ".mp3", ".flac", ".aiff", ".aif"]
-    )
+    export_formats: list[str] = field(default_factory=lambda: list(_DEFAULT_EXPORT_FORMATS))
     fuzzy_match_threshold: float = 65.0
 
 
-@dataclass
+@dataclass(slots=True)
 class LinkConfig:
     """Ableton Link configuration."""
 
@@ -62,7 +72,7 @@ class LinkConfig:
     device_history_days: int = 30
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """Logging configuration."""
 
@@ -73,7 +83,7 @@ class LoggingConfig:
     backup_count: int = 5  # Keep 5 rotated files
 
 
-@dataclass
+@dataclass(slots=True)
 class UIConfig:
     """User interface configuration."""
 
@@ -85,9 +95,16 @@ class UIConfig:
     date_format: str = "%Y-%m-%d %H:%M"
     # Gradient modes only: "rainbow", "random", or gradient options (solid colors disabled)
     waveform_color_mode: str = "random"
+    # Application icon that loaded successfully last time (skips probing on startup)
+    cached_icon_path: str | None = None
+
+    def __post_init__(self) -> None:
+        # The single "dark" theme was split into colour themes; it maps to orange
+        if self.theme == "dark":
+            self.theme = "orange"
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Main configuration container."""
 
@@ -101,6 +118,33 @@ class Config:
     version: str = "1.0.6"
 
 
+@cache
+def _field_names(cls: type) -> frozenset[str]:
+    """Return the field names declared on a config dataclass."""
+    return frozenset(f.name for f in fields(cls))
+
+
+def _build_section(cls: type, data: Any) -> Any:
+    """Build a config section from its JSON dict, ignoring unknown keys.
+
+    Keys written by newer or older versions of the app are dropped instead of
+    making the dataclass constructor raise.
+    """
+    if not isinstance(data, dict):
+        return cls()
+    names = _field_names(cls)
+    return cls(**{key: value for key, value in data.items() if key in names})
+
+
+def _section_to_dict(section: Any) -> dict[str, Any]:
+    """Read a config section's fields into a dict, in declaration order.
+
+    The sections only hold scalars and lists of strings, so unlike asdict()
+    nothing is recursed into or deep-copied.
+    """
+    return {name: getattr(section, name) for name in type(section).__slots__}
+
+
 class ConfigManager:
     """Manages application configuration persistence."""
 
@@ -112,6 +156,8 @@ class ConfigManager:
         """
         self.config_path = config_path or get_config_path()
         self._config: Config | None = None
+        # JSON last read from or written to disk; save() skips the write when unchanged
+        self._last_serialized: bytes | None = None
 
     @property
     def config(self) -> Config:
@@ -130,9 +176,11 @@ class ConfigManager:
             return Config()
 
         try:
-            with open(self.config_path, encoding="utf-8") as f:
-                data = json.load(f)
-            return self._dict_to_config(data)
+            raw = self.config_path.read_bytes()
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            config = self._dict_to_config(data)
+            self._last_serialized = self._serialize(config)
+            return config
         except (OSError, json.JSONDecodeError) as e:
             logger = get_logger(__name__)
             logger.warning(f"Failed to load config: {e}")
@@ -143,10 +191,19 @@ class ConfigManager:
         if self._config is None:
             return
 
+        payload = self._serialize(self._config)
+        if payload == self._last_serialized:
+            return  # Nothing changed since the last load/save
+
         try:
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(self._config_to_dict(self._config), f, indent=2)
+            # Write beside the target and swap it in, so a crash mid-write never
+            # leaves a truncated config. No fsync: losing the latest window geometry
+            # on power loss is acceptable, a corrupt file is not.
+            tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self.config_path)
+            self._last_serialized = payload
         except OSError as e:
             logger = get_logger(__name__)
             logger.warning(f"Failed to save config: {e}")
@@ -173,15 +230,25 @@ class ConfigManager:
                 setattr(config, key, value)
         self.save()
 
+    def _serialize(self, config: Config) -> bytes:
+        """Serialize a Config to the UTF-8 JSON stored on disk.
+
+        orjson serializes the dataclasses natively; the stdlib fallback goes
+        through _config_to_dict.
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        return json.dumps(self._config_to_dict(config), indent=2).encode("utf-8")
+
     def _config_to_dict(self, config: Config) -> dict:
         """Convert Config dataclass to dictionary for JSON serialization."""
         return {
-            "window": asdict(config.window),
-            "scan": asdict(config.scan),
-            "export": asdict(config.export),
-            "link": asdict(config.link),
-            "logging": asdict(config.logging),
-            "ui": asdict(config.ui),
+            "window": _section_to_dict(config.window),
+            "scan": _section_to_dict(config.scan),
+            "export": _section_to_dict(config.export),
+            "link": _section_to_dict(config.link),
+            "logging": _section_to_dict(config.logging),
+            "ui": _section_to_dict(config.ui),
             "first_run": config.first_run,
             "version": config.version,
         }
@@ -189,27 +256,21 @@ class ConfigManager:
     def _dict_to_config(self, data: dict) -> Config:
         """Convert dictionary to Config dataclass."""
         return Config(
-            window=WindowConfig(**data.get("window", {})),
-            scan=ScanConfig(**data.get("scan", {})),
-            export=ExportConfig(**data.get("export", {})),
-            link=LinkConfig(**data.get("link", {})),
-            logging=LoggingConfig(**data.get("logging", {})),
-            ui=UIConfig(**data.get("ui", {})),
+            window=_build_section(WindowConfig, data.get("window")),
+            scan=_build_section(ScanConfig, data.get("scan")),
+            export=_build_section(ExportConfig, data.get("export")),
+            link=_build_section(LinkConfig, data.get("link")),
+            logging=_build_section(LoggingConfig, data.get("logging")),
+            ui=_build_section(UIConfig, data.get("ui")),
             first_run=data.get("first_run", True),
             version=data.get("version", "1.0.1"),
         )
 
 
-# Global configuration manager instance
-_config_manager: ConfigManager | None = None
-
-
+@cache
 def get_config_manager() -> ConfigManager:
-    """Get the global configuration manager instance."""
-    global _config_manager
-    if _config_manager is None:
-        _config_manager = ConfigManager()
-    return _config_manager
+    """Get the global configuration manager instance (created on first call)."""
+    return ConfigManager()
 
 
 def get_config() -> Config:
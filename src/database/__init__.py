@@ -1,21 +1,28 @@
 """Database module - SQLAlchemy models and session management."""
 
+from typing import Any
+
 from .db import close_database, get_engine, get_session, init_database, reset_database
-from .models import (
-    AppSettings,
-    Base,
-    Collection,
-    CollectionType,
-    Export,
-    LinkDevice,
-    LiveInstallation,
-    Location,
-    LocationType,
-    Project,
-    ProjectCollection,
-    ProjectStatus,
-    ProjectTag,
-    Tag,
+
+# ORM models are resolved on first access, so startup code that only needs
+# init_database()/close_database() does not import the model definitions.
+_MODEL_NAMES = frozenset(
+    {
+        "AppSettings",
+        "Base",
+        "Collection",
+        "CollectionType",
+        "Export",
+        "LinkDevice",
+        "LiveInstallation",
+        "Location",
+        "LocationType",
+        "Project",
+        "ProjectCollection",
+        "ProjectStatus",
+        "ProjectTag",
+        "Tag",
+    }
 )
 
 __all__ = [
@@ -39,3 +46,17 @@ __all__ = [
     "ProjectStatus",
     "CollectionType",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import ORM models lazily (PEP 562)."""
+    if name in _MODEL_NAMES:
+        from . import models
+
+        return getattr(models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    """Include the lazily resolved models in ``dir(src.database)``."""
+    return sorted(set(globals()) | _MODEL_NAMES)
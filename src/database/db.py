@@ -1,11 +1,13 @@
 """Database engine and session management for Ableton Hub."""
 
+import re
 from collections.abc import Generator
 from contextlib import contextmanager
+from functools import cache
 from pathlib import Path
 
-from sqlalchemy import create_engine, event, text
-from sqlalchemy.engine import Engine
+from sqlalchemy import bindparam, create_engine, event, text
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
 from ..utils.logging import get_logger
@@ -13,9 +15,24 @@ from ..utils.paths import get_database_path
 
 logger = get_logger(__name__)
 
-# Global engine and session factory
+# Applied to every new connection in one executescript() call
+_CONNECTION_PRAGMAS = """
+    -- Enable foreign keys
+    PRAGMA foreign_keys=ON;
+    -- Use WAL mode for better concurrent access
+    PRAGMA journal_mode=WAL;
+    -- Optimize for speed
+    PRAGMA synchronous=NORMAL;
+    PRAGMA cache_size=-64000;  -- 64MB cache
+    PRAGMA temp_store=MEMORY;
+    -- Serve page reads from the OS page cache instead of read() copies
+    PRAGMA mmap_size=268435456;  -- 256MB
+    -- Truncate the WAL back to 64MB after checkpoints so it can't grow unbounded
+    PRAGMA journal_size_limit=67108864;
+"""
+
+# Global engine (the session factory is cached by get_session_factory)
 _engine: Engine | None = None
-_session_factory: scoped_session | None = None
 
 
 def get_engine(db_path: Path | None = None) -> Engine:
@@ -37,7 +54,8 @@ def get_engine(db_path: Path | None = None) -> Engine:
         _engine = create_engine(
             f"sqlite:///{path}",
             echo=False,  # Set to True for SQL debugging
-            pool_pre_ping=True,
+            # No pool_pre_ping: a local SQLite file connection can't be dropped by a
+            # server, so the per-checkout "SELECT 1" liveness probe is pure overhead
             connect_args={
                 "check_same_thread": False,  # Allow multi-threaded access
                 "timeout": 30,
@@ -47,34 +65,29 @@ def get_engine(db_path: Path | None = None) -> Engine:
         # Enable SQLite optimizations
         @event.listens_for(_engine, "connect")
         def set_sqlite_pragma(dbapi_connection, connection_record):
-            cursor = dbapi_connection.cursor()
-            # Enable foreign keys
-            cursor.execute("PRAGMA foreign_keys=ON")
-            # Use WAL mode for better concurrent access
-            cursor.execute("PRAGMA journal_mode=WAL")
-            # Optimize for speed
-            cursor.execute("PRAGMA synchronous=NORMAL")
-            cursor.execute("PRAGMA cache_size=-64000")  # 64MB cache
-            cursor.execute("PRAGMA temp_store=MEMORY")
-            cursor.close()
+            dbapi_connection.executescript(_CONNECTION_PRAGMAS)
 
     return _engine
 
 
+@cache
 def get_session_factory() -> scoped_session:
     """Get or create the session factory.
 
+    Built on first call and cached until close_database() discards it.
+
     Returns:
         Scoped session factory for thread-safe sessions.
     """
-    global _session_factory
+    factory = sessionmaker(bind=get_engine(), expire_on_commit=False)
+    return scoped_session(factory)
 
-    if _session_factory is None:
-        engine = get_engine()
-        factory = sessionmaker(bind=engine, expire_on_commit=False)
-        _session_factory = scoped_session(factory)
 
-    return _session_factory
+def _discard_session_factory() -> None:
+    """Remove thread-local sessions and drop the cached session factory."""
+    if get_session_factory.cache_info().currsize:
+        get_session_factory().remove()
+        get_session_factory.cache_clear()
 
 
 def get_session() -> Session:
@@ -87,7 +100,7 @@ def get_session() -> Session:
 
 
 @contextmanager
-def session_scope() -> Generator[Session, None, None]:
+def session_scope(existing: Session | None = None) -> Generator[Session, None, None]:
     """Provide a transactional scope around a series of operations.
 
     Usage:
@@ -95,9 +108,19 @@ def session_scope() -> Generator[Session, None, None]:
             session.add(obj)
             # Auto-commits on success, rolls back on exception
 
+    Args:
+        existing: Session the caller already has open. It is yielded as is and
+            left for the caller to commit and close, so several operations can
+            share one session (and its identity map) instead of each opening
+            and closing the thread's session in turn.
+
     Yields:
         Database session.
     """
+    if existing is not None:
+        yield existing
+        return
+
     session = get_session()
     try:
         yield session
@@ -129,127 +152,230 @@ def init_database(db_path: Path | None = None) -> None:
     # Create FTS5 virtual table for full-text search
     _create_fts_table(engine)
 
+    # Open the pooled connections now, during startup, so the first queries from
+    # the UI and worker threads don't each pay for connect + PRAGMA setup
+    _warm_pool(engine)
+
+
+def _warm_pool(engine: Engine) -> None:
+    """Fill the connection pool by checking out pool_size connections at once.
+
+    Args:
+        engine: SQLAlchemy engine.
+    """
+    connections = [engine.connect() for _ in range(engine.pool.size())]
+    for conn in connections:
+        conn.close()
+
+
+# FTS statements are built once here and reused on every call.
+#
+# projects_fts is an external-content table: it stores only the index and reads
+# column text back from projects when needed, so it's no larger than a
+# contentless (content='') table would be. Unlike a contentless table it
+# supports the 'rebuild' command bulk_load() relies on, and its delete
+# triggers work on every SQLite version (contentless deletes need 3.43+).
+
+# Columns indexed by projects_fts, in table order
+_FTS_COLUMNS = ("name", "export_song_name", "notes", "tags", "plugins", "devices")
+_FTS_COLUMN_LIST = ", ".join(_FTS_COLUMNS)
+
+_FTS_TABLE_SQL = text(f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        {_FTS_COLUMN_LIST},
+        content='projects',
+        content_rowid='id',
+        prefix='2 3 4'
+    )
+""")
+
+_FTS_REBUILD_SQL = text("INSERT INTO projects_fts(projects_fts) VALUES('rebuild')")
+_FTS_OPTIMIZE_SQL = text("INSERT INTO projects_fts(projects_fts) VALUES('optimize')")
+
+# Trigger bodies: index a row's new values, or remove its old ones. NULL and
+# '[]' both tokenize to nothing, so plugins/devices are passed through as stored.
+_FTS_NEW_VALUES = ", ".join(f"new.{column}" for column in _FTS_COLUMNS)
+_FTS_OLD_VALUES = ", ".join(f"old.{column}" for column in _FTS_COLUMNS)
+_FTS_INSERT_NEW = (
+    f"INSERT INTO projects_fts(rowid, {_FTS_COLUMN_LIST}) VALUES (new.id, {_FTS_NEW_VALUES});"
+)
+_FTS_DELETE_OLD = (
+    f"INSERT INTO projects_fts(projects_fts, rowid, {_FTS_COLUMN_LIST}) "
+    f"VALUES ('delete', old.id, {_FTS_OLD_VALUES});"
+)
+
+# Triggers that keep projects_fts in sync with the projects table, by name.
+# bulk_load() drops and recreates them around large imports.
+_FTS_TRIGGERS = {
+    "projects_ai": text(f"""
+        CREATE TRIGGER IF NOT EXISTS projects_ai AFTER INSERT ON projects BEGIN
+            {_FTS_INSERT_NEW}
+        END
+    """),
+    "projects_ad": text(f"""
+        CREATE TRIGGER IF NOT EXISTS projects_ad AFTER DELETE ON projects BEGIN
+            {_FTS_DELETE_OLD}
+        END
+    """),
+    "projects_au": text(f"""
+        CREATE TRIGGER IF NOT EXISTS projects_au AFTER UPDATE ON projects BEGIN
+            {_FTS_DELETE_OLD}
+            {_FTS_INSERT_NEW}
+        END
+    """),
+}
+
+
+_FTS_DROP_TRIGGERS = [text(f"DROP TRIGGER IF EXISTS {name}") for name in _FTS_TRIGGERS]
+
+_FTS_TRIGGER_COUNT_SQL = text(
+    "SELECT count(*) FROM sqlite_master WHERE type='trigger' AND name IN :names"
+).bindparams(bindparam("names", value=list(_FTS_TRIGGERS), expanding=True))
+
 
 def _create_fts_table(engine: Engine) -> None:
     """Create the FTS5 virtual table for project search.
 
+    Also restores the sync triggers (and rebuilds the index) if a bulk_load()
+    was interrupted before it could put them back.
+
     Args:
         engine: SQLAlchemy engine.
     """
-    with engine.connect() as conn:
-        # Check if FTS table exists
-        result = conn.execute(
-            text("SELECT name FROM sqlite_master WHERE type='table' AND name='projects_fts'")
-        )
-        if result.fetchone() is None:
-            # Create FTS5 virtual table with plugins and devices
-            conn.execute(text("""
-                CREATE VIRTUAL TABLE projects_fts USING fts5(
-                    name,
-                    export_song_name,
-                    notes,
-                    tags,
-                    plugins,
-                    devices,
-                    content='projects',
-                    content_rowid='id'
-                )
-            """))
-
-            # Create triggers to keep FTS in sync
-            conn.execute(text("""
-                CREATE TRIGGER projects_ai AFTER INSERT ON projects BEGIN
-                    INSERT INTO projects_fts(
-                        rowid, name, export_song_name, notes, tags, plugins, devices
-                    )
-                    VALUES (
-                        new.id,
-                        new.name,
-                        new.export_song_name,
-                        new.notes,
-                        new.tags,
-                        COALESCE(new.plugins, '[]'),
-                        COALESCE(new.devices, '[]')
-                    );
-                END
-            """))
-
-            # Create triggers to keep FTS in sync
-            conn.execute(text("""
-                CREATE TRIGGER projects_ad AFTER DELETE ON projects BEGIN
-                    INSERT INTO projects_fts(
-                        projects_fts, rowid, name, export_song_name, notes, tags, plugins, devices
-                    )
-                    VALUES (
-                        'delete', old.id, old.name, old.export_song_name, old.notes, old.tags,
-                        COALESCE(old.plugins, '[]'), COALESCE(old.devices, '[]')
-                    );
-                END
-            """))
-
-            conn.execute(text("""
-                CREATE TRIGGER projects_au AFTER UPDATE ON projects BEGIN
-                    INSERT INTO projects_fts(
-                        projects_fts, rowid, name, export_song_name, notes, tags, plugins, devices
-                    )
-                    VALUES (
-                        'delete', old.id, old.name, old.export_song_name, old.notes, old.tags,
-                        COALESCE(old.plugins, '[]'), COALESCE(old.devices, '[]')
-                    );
-                    INSERT INTO projects_fts(
-                        rowid, name, export_song_name, notes, tags, plugins, devices
-                    )
-                    VALUES (
-                        new.id,
-                        new.name,
-                        new.export_song_name,
-                        new.notes,
-                        new.tags,
-                        COALESCE(new.plugins, '[]'),
-                        COALESCE(new.devices, '[]')
-                    );
-                END
-            """))
-
-        conn.commit()
-
-
-def search_projects_fts(query: str, limit: int = 100) -> list:
+    # One transaction for the whole block, committed when it exits
+    with engine.begin() as conn:
+        # Create FTS5 virtual table with plugins and devices (no-op if it exists)
+        conn.execute(_FTS_TABLE_SQL)
+
+        # Triggers to keep FTS in sync; the usual startup case is that all exist
+        trigger_count = conn.execute(_FTS_TRIGGER_COUNT_SQL).scalar_one()
+        if trigger_count < len(_FTS_TRIGGERS):
+            for statement in _FTS_TRIGGERS.values():
+                conn.execute(statement)
+
+            # Rows written while the triggers were missing aren't indexed yet
+            # (cheap on a new database, where projects is still empty)
+            _rebuild_fts(conn)
+
+
+def _rebuild_fts(conn: Connection) -> None:
+    """Rebuild the whole FTS index from the projects table in one pass.
+
+    A large rebuild is written out as several index segments; 'optimize'
+    merges them into one so searches don't have to consult each of them.
+
+    Args:
+        conn: Connection inside the caller's transaction.
+    """
+    conn.execute(_FTS_REBUILD_SQL)
+    conn.execute(_FTS_OPTIMIZE_SQL)
+
+
+@contextmanager
+def bulk_load() -> Generator[None, None, None]:
+    """Suspend per-row FTS maintenance for a large batch of project writes.
+
+    The FTS sync triggers are dropped for the duration of the block; afterwards
+    the index is rebuilt with a single sequential pass over projects and the
+    triggers are recreated. Searches run inside the block won't see rows
+    written in it.
+
+    Usage:
+        with bulk_load():
+            ...  # insert/update many projects
+    """
+    engine = get_engine()
+    with engine.begin() as conn:
+        for statement in _FTS_DROP_TRIGGERS:
+            conn.execute(statement)
+
+    try:
+        yield
+    finally:
+        with engine.begin() as conn:
+            _rebuild_fts(conn)
+            for statement in _FTS_TRIGGERS.values():
+                conn.execute(statement)
+
+
+# A query made of one FTS5 bareword can be matched without phrase quoting
+_FTS_BAREWORD = re.compile(r"\w+")
+_FTS_KEYWORDS = frozenset({"AND", "OR", "NOT", "NEAR"})
+# Inside an FTS5 "..." string the only special character is the quote itself,
+# which is escaped by doubling; operators and punctuation are plain text there
+_FTS_QUOTE_ESCAPE = str.maketrans({'"': '""'})
+
+# Named-parameter SQL understood by both SQLAlchemy text() and sqlite3 directly
+_FTS_SEARCH_QUERY = """
+    SELECT rowid FROM projects_fts
+    WHERE projects_fts MATCH :pattern
+    ORDER BY rank
+    LIMIT :limit
+"""
+_FTS_SEARCH_SQL = text(_FTS_SEARCH_QUERY)
+
+
+def search_projects_fts(query: str, limit: int = 100, session: Session | None = None) -> list:
     """Search projects using full-text search.
 
     Args:
         query: Search query string.
         limit: Maximum results to return.
+        session: Optional session to run the search on. Callers that are about to
+            query projects with their own session should pass it, so the search
+            reuses that session's connection instead of checking out another one.
 
     Returns:
         List of project IDs matching the query.
     """
-    with get_engine().connect() as conn:
-        # Escape special FTS characters
-        safe_query = query.replace('"', '""')
-
-        result = conn.execute(
-            text(f"""
-            SELECT rowid FROM projects_fts
-            WHERE projects_fts MATCH '"{safe_query}"*'
-            ORDER BY rank
-            LIMIT :limit
-        """),
-            {"limit": limit},
-        )
-
-        return [row[0] for row in result.fetchall()]
+    if _FTS_BAREWORD.fullmatch(query) and query.upper() not in _FTS_KEYWORDS:
+        # Single plain word: a bare prefix term needs no phrase handling
+        pattern = f"{query}*"
+    else:
+        # Escape special FTS characters and match the input as a phrase prefix
+        safe_query = query.translate(_FTS_QUOTE_ESCAPE)
+        pattern = f'"{safe_query}"*'
+
+    # The pattern is bound, so the SQL text is constant and its prepared
+    # statement is reused for every search. "rank" is bm25() by default, and
+    # ordering by the rank column instead of calling bm25() lets FTS5 sort
+    # the matches internally rather than handing every row to SQLite's sorter.
+    params = {"pattern": pattern, "limit": limit}
+
+    if session is not None:
+        # The search only reads projects_fts, so don't flush the caller's
+        # pending objects just to run it
+        with session.no_autoflush:
+            return list(session.execute(_FTS_SEARCH_SQL, params).scalars())
+
+    # No session to share: run on a pooled DBAPI connection directly, skipping
+    # SQLAlchemy's statement and result layers for this one fixed query
+    conn = get_engine().raw_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            return [row[0] for row in cursor.execute(_FTS_SEARCH_QUERY, params)]
+        finally:
+            cursor.close()
+    finally:
+        conn.close()  # Returns the connection to the pool
 
 
 def close_database() -> None:
     """Close database connections and cleanup."""
-    global _engine, _session_factory
+    global _engine
 
-    if _session_factory is not None:
-        _session_factory.remove()
-        _session_factory = None
+    _discard_session_factory()
 
     if _engine is not None:
+        # Let SQLite refresh planner statistics for tables whose queries would
+        # benefit; it only runs ANALYZE where the stats have drifted
+        try:
+            with _engine.connect() as conn:
+                conn.execute(text("PRAGMA optimize"))
+        except Exception as e:
+            logger.warning(f"PRAGMA optimize failed: {e}")
+
         _engine.dispose()
         _engine = None
 
@@ -263,13 +389,11 @@ def reset_database() -> bool:
     Returns:
         True if reset was successful, False otherwise.
     """
-    global _engine, _session_factory
+    global _engine
 
     try:
         # Close all existing connections
-        if _session_factory is not None:
-            _session_factory.remove()
-            _session_factory = None
+        _discard_session_factory()
 
         if _engine is not None:
             _engine.dispose()
@@ -278,20 +402,18 @@ def reset_database() -> bool:
         # Get database path
         db_path = get_database_path()
 
-        # Delete database file and related files (WAL, SHM)
-        if db_path.exists():
-            db_path.unlink()
-            logger.info(f"Deleted database file: {db_path}")
-
-        # Delete WAL and SHM files if they exist
-        wal_path = db_path.with_suffix(".db-wal")
-        shm_path = db_path.with_suffix(".db-shm")
-        if wal_path.exists():
-            wal_path.unlink()
-            logger.info(f"Deleted WAL file: {wal_path}")
-        if shm_path.exists():
-            shm_path.unlink()
-            logger.info(f"Deleted SHM file: {shm_path}")
+        # Delete database file and related files (WAL, SHM). unlink() is attempted
+        # directly rather than after an exists() check: one syscall per file.
+        for path in (
+            db_path,
+            db_path.with_name(db_path.name + "-wal"),
+            db_path.with_name(db_path.name + "-shm"),
+        ):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            logger.info(f"Deleted database file: {path}")
 
         # Reinitialize database
         init_database()
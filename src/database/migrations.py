@@ -1,601 +1,626 @@
 """Database migration utilities for Ableton Hub."""
 
-from sqlalchemy import text
-from sqlalchemy.engine import Engine
-
-
-def migration_add_track_fields(engine: Engine) -> None:
-    """Add track_name and track_artwork_path columns to project_collections table."""
-    with engine.connect() as conn:
-        # Check if columns already exist
-        result = conn.execute(text("PRAGMA table_info(project_collections)"))
-        columns = [row[1] for row in result.fetchall()]
+import json
+import weakref
+from collections.abc import Iterable
+from typing import Any
 
-        if "track_name" not in columns:
-            conn.execute(text("ALTER TABLE project_collections ADD COLUMN track_name TEXT"))
-
-        if "track_artwork_path" not in columns:
-            conn.execute(text("ALTER TABLE project_collections ADD COLUMN track_artwork_path TEXT"))
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
 
-        conn.commit()
+from ..utils.logging import get_logger
 
+logger = get_logger(__name__)
 
-def migration_add_phase_25_fields(engine: Engine) -> None:
-    """Add Phase 2.5 fields: smart collections, file_hash, preview fields."""
-    with engine.connect() as conn:
-        # Check existing columns
-        result = conn.execute(text("PRAGMA table_info(projects)"))
-        project_columns = [row[1] for row in result.fetchall()]
 
-        result = conn.execute(text("PRAGMA table_info(collections)"))
-        collection_columns = [row[1] for row in result.fetchall()]
+def _snapshot_columns(conn: Connection, tables: Iterable[str]) -> dict[str, set[str]]:
+    """Read the column names of the given tables in one query.
 
-        # Add to projects table
-        if "file_hash" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN file_hash TEXT"))
-
-        if "thumbnail_path" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN thumbnail_path TEXT"))
+    Args:
+        conn: Open connection.
+        tables: Names of the tables to read.
 
-        if "preview_audio_path" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN preview_audio_path TEXT"))
+    Returns:
+        Dict mapping each table name to the set of its column names (empty
+        for a table that doesn't exist).
+    """
+    columns: dict[str, set[str]] = {table: set() for table in tables}
+    if not columns:
+        return columns
 
-        # Add to collections table
-        if "is_smart" not in collection_columns:
-            conn.execute(text("ALTER TABLE collections ADD COLUMN is_smart INTEGER DEFAULT 0"))
+    # pragma_table_info() is the table-valued form of PRAGMA table_info, so
+    # every table's columns come back from one UNION ALL
+    query = " UNION ALL ".join(
+        f"SELECT '{table}', name FROM pragma_table_info('{table}')" for table in columns
+    )
+    for table, name in conn.exec_driver_sql(query):
+        columns[table].add(name)
+    return columns
 
-        if "smart_rules" not in collection_columns:
-            conn.execute(text("ALTER TABLE collections ADD COLUMN smart_rules TEXT"))
 
-        conn.commit()
+class _ColumnSnapshot(dict[str, set[str]]):
+    """Column names per table, each read on first use.
 
+    Shared by every migration in one run_migrations() call, so a table is read
+    at most once, and not at all when no pending migration checks it.
+    """
 
-def migration_add_project_metadata_fields(engine: Engine) -> None:
-    """Add project metadata fields extracted from .als files."""
+    def __init__(self, conn: Connection):
+        super().__init__()
+        self._conn = conn
 
-    with engine.connect() as conn:
-        # Check existing columns
-        result = conn.execute(text("PRAGMA table_info(projects)"))
-        project_columns = [row[1] for row in result.fetchall()]
+    def __missing__(self, table: str) -> set[str]:
+        columns = self[table] = _snapshot_columns(self._conn, [table])[table]
+        return columns
 
-        # Add plugin and device fields
-        if "plugins" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN plugins TEXT DEFAULT '[]'"))
 
-        if "devices" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN devices TEXT DEFAULT '[]'"))
+def _add_column(
+    conn: Connection, schema: dict[str, set[str]], table: str, name: str, definition: str
+) -> bool:
+    """Add a column to a table unless the schema snapshot already has it.
 
-        if "tempo" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN tempo REAL"))
+    The snapshot is updated in place, so later migrations checking the same
+    table see the column without reading the schema again.
 
-        if "time_signature" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN time_signature TEXT"))
+    Args:
+        conn: Open connection.
+        schema: Column names per table, as passed to the migrations.
+        table: Table to alter.
+        name: Column name.
+        definition: Column type and constraints, as written after the name.
 
-        if "track_count" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN track_count INTEGER DEFAULT 0"))
+    Returns:
+        True if the column was added, False if it already existed.
+    """
+    columns = schema[table]
+    if name in columns:
+        return False
+    conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+    columns.add(name)
+    return True
+
+
+# (table, column, definition) for each column a plain column migration adds,
+# keyed by the schema version that adds it
+_COLUMN_ADDS: dict[int, tuple[tuple[str, str, str], ...]] = {
+    2: (
+        ("project_collections", "track_name", "TEXT"),
+        ("project_collections", "track_artwork_path", "TEXT"),
+    ),
+    3: (
+        ("projects", "file_hash", "TEXT"),
+        ("projects", "thumbnail_path", "TEXT"),
+        ("projects", "preview_audio_path", "TEXT"),
+        ("collections", "is_smart", "INTEGER DEFAULT 0"),
+        ("collections", "smart_rules", "TEXT"),
+    ),
+    4: (
+        ("projects", "plugins", "TEXT DEFAULT '[]'"),
+        ("projects", "devices", "TEXT DEFAULT '[]'"),
+        ("projects", "tempo", "REAL"),
+        ("projects", "time_signature", "TEXT"),
+        ("projects", "track_count", "INTEGER DEFAULT 0"),
+        ("projects", "audio_tracks", "INTEGER DEFAULT 0"),
+        ("projects", "midi_tracks", "INTEGER DEFAULT 0"),
+        ("projects", "return_tracks", "INTEGER DEFAULT 0"),
+        ("projects", "has_master_track", "INTEGER DEFAULT 1"),
+        ("projects", "arrangement_length", "REAL"),
+        ("projects", "ableton_version", "TEXT"),
+        ("projects", "sample_references", "TEXT DEFAULT '[]'"),
+        ("projects", "has_automation", "INTEGER DEFAULT 0"),
+        ("projects", "last_parsed", "TEXT"),
+    ),
+    8: (
+        ("projects", "musical_key", "VARCHAR(10)"),
+        ("projects", "scale_type", "VARCHAR(50)"),
+        ("projects", "is_in_key", "BOOLEAN"),
+    ),
+    9: (("project_collections", "export_id", "INTEGER REFERENCES exports(id)"),),
+    10: (("collections", "artist_name", "VARCHAR(255)"),),
+    # Versions 16-18 share one migration, see migration_add_scan_metadata_columns()
+    16: (
+        # JSON array of timeline markers (locators) with 'time' and 'text' fields
+        ("projects", "timeline_markers", "TEXT DEFAULT '[]'"),
+        # Pre-computed ML feature vector, so similarity doesn't re-parse .als files
+        ("projects", "feature_vector", "TEXT"),
+        # .als fields stored so project properties don't re-parse the file
+        ("projects", "export_filenames", "TEXT"),
+        ("projects", "annotation", "TEXT"),
+        ("projects", "master_track_name", "VARCHAR(255)"),
+    ),
+    19: (
+        ("projects", "furthest_sample_end", "REAL"),
+        ("projects", "sample_duration_seconds", "REAL"),
+    ),
+}
 
-        if "audio_tracks" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN audio_tracks INTEGER DEFAULT 0"))
 
-        if "midi_tracks" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN midi_tracks INTEGER DEFAULT 0"))
+def _add_columns(conn: Connection, schema: dict[str, set[str]] | None, version: int) -> None:
+    """Add the columns _COLUMN_ADDS lists for a schema version.
 
-        if "return_tracks" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN return_tracks INTEGER DEFAULT 0"))
+    Args:
+        conn: Open connection.
+        schema: Column names per table, or None to read the tables involved.
+        version: Schema version whose columns to add.
+    """
+    additions = _COLUMN_ADDS[version]
+    if schema is None:
+        schema = _snapshot_columns(conn, dict.fromkeys(table for table, _, _ in additions))
+    for table, name, definition in additions:
+        _add_column(conn, schema, table, name, definition)
 
-        if "has_master_track" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN has_master_track INTEGER DEFAULT 1"))
 
-        if "arrangement_length" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN arrangement_length REAL"))
+def migration_add_track_fields(conn: Connection, schema: dict[str, set[str]] | None = None) -> None:
+    """Add track_name and track_artwork_path columns to project_collections table."""
+    _add_columns(conn, schema, 2)
 
-        if "ableton_version" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN ableton_version TEXT"))
 
-        if "sample_references" not in project_columns:
-            conn.execute(
-                text("ALTER TABLE projects ADD COLUMN sample_references TEXT DEFAULT '[]'")
-            )
+def migration_add_phase_25_fields(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Add Phase 2.5 fields: smart collections, file_hash, preview fields."""
+    _add_columns(conn, schema, 3)
 
-        if "has_automation" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN has_automation INTEGER DEFAULT 0"))
 
-        if "last_parsed" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN last_parsed TEXT"))
+def migration_add_project_metadata_fields(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Add project metadata fields extracted from .als files.
 
-        conn.commit()
+    The columns are added in place rather than by rebuilding projects: ADD
+    COLUMN only rewrites the table's schema entry (existing rows read the
+    default), while a copy-and-rename rebuild would rewrite every row.
+    """
+    _add_columns(conn, schema, 4)
 
 
-def migration_update_fts_for_plugins(engine: Engine) -> None:
+def migration_update_fts_for_plugins(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
     """Update FTS table to include plugins and devices fields."""
-    with engine.connect() as conn:
-        # Check if FTS table exists
-        result = conn.execute(
-            text("SELECT name FROM sqlite_master WHERE type='table' AND name='projects_fts'")
-        )
-
-        if result.fetchone() is not None:
-            # Check if plugins/devices columns exist in FTS
-            result = conn.execute(text("PRAGMA table_info(projects_fts)"))
-            fts_columns = [row[1] for row in result.fetchall()]
-
-            # If FTS table exists but doesn't have plugins/devices, we need to recreate it
-            if "plugins" not in fts_columns or "devices" not in fts_columns:
-                # Drop old FTS table and triggers
-                conn.execute(text("DROP TABLE IF EXISTS projects_fts"))
-                conn.execute(text("DROP TRIGGER IF EXISTS projects_ai"))
-                conn.execute(text("DROP TRIGGER IF EXISTS projects_ad"))
-                conn.execute(text("DROP TRIGGER IF EXISTS projects_au"))
-
-                # Recreate FTS table with plugins and devices
-                conn.execute(text("""
-                    CREATE VIRTUAL TABLE projects_fts USING fts5(
-                        name,
-                        export_song_name,
-                        notes,
-                        tags,
-                        plugins,
-                        devices,
-                        content='projects',
-                        content_rowid='id'
-                    )
-                """))
-
-                # Recreate triggers with plugins and devices
-                conn.execute(text("""
-                    CREATE TRIGGER projects_ai AFTER INSERT ON projects BEGIN
-                        INSERT INTO projects_fts(
-                            rowid, name, export_song_name, notes, tags, plugins, devices
-                        )
-                        VALUES (
-                            new.id,
-                            new.name,
-                            new.export_song_name,
-                            new.notes,
-                            new.tags,
-                            COALESCE(new.plugins, '[]'),
-                            COALESCE(new.devices, '[]')
-                        );
-                    END
-                """))
-
-                conn.execute(text("""
-                    CREATE TRIGGER projects_ad AFTER DELETE ON projects BEGIN
-                        INSERT INTO projects_fts(
-                            projects_fts, rowid, name, export_song_name, notes, tags,
-                            plugins, devices
-                        )
-                        VALUES (
-                            'delete', old.id, old.name, old.export_song_name, old.notes, old.tags,
-                            COALESCE(old.plugins, '[]'), COALESCE(old.devices, '[]')
-                        );
-                    END
-                """))
-
-                conn.execute(text("""
-                    CREATE TRIGGER projects_au AFTER UPDATE ON projects BEGIN
-                        INSERT INTO projects_fts(
-                            projects_fts, rowid, name, export_song_name, notes, tags,
-                            plugins, devices
-                        )
-                        VALUES (
-                            'delete', old.id, old.name, old.export_song_name, old.notes, old.tags,
-                            COALESCE(old.plugins, '[]'), COALESCE(old.devices, '[]')
-                        );
-                        INSERT INTO projects_fts(
-                            rowid, name, export_song_name, notes, tags, plugins, devices
-                        )
-                        VALUES (
-                            new.id,
-                            new.name,
-                            new.export_song_name,
-                            new.notes,
-                            new.tags,
-                            COALESCE(new.plugins, '[]'),
-                            COALESCE(new.devices, '[]')
-                        );
-                    END
-                """))
-
-                # Rebuild FTS index from existing projects
-                conn.execute(text("""
-                    INSERT INTO projects_fts(
-                        rowid, name, export_song_name, notes, tags, plugins, devices
-                    )
-                    SELECT id, name, export_song_name, notes, tags,
-                           COALESCE(plugins, '[]'), COALESCE(devices, '[]')
-                    FROM projects
-                """))
-
-                conn.commit()
-
-
-def migration_add_arrangement_duration(engine: Engine) -> None:
+    from .db import _FTS_COLUMNS, _FTS_DROP_TRIGGERS, _FTS_TABLE_SQL, _FTS_TRIGGERS, _rebuild_fts
+
+    if schema is None:
+        schema = _snapshot_columns(conn, ["projects_fts"])
+    # PRAGMA table_info returns no rows for a missing table, so one read
+    # answers both whether the FTS table exists and which columns it has
+    fts_columns = schema["projects_fts"]
+
+    if fts_columns:
+        # If FTS table exists but doesn't have plugins/devices, we need to recreate it
+        if "plugins" not in fts_columns or "devices" not in fts_columns:
+            # Drop old FTS table and triggers
+            conn.exec_driver_sql("DROP TABLE IF EXISTS projects_fts")
+            for statement in _FTS_DROP_TRIGGERS:
+                conn.execute(statement)
+
+            # Recreate the FTS table and triggers from the definitions in db.py,
+            # which build every statement from one column list. The table gets
+            # its prefix indexes here, so migration 20 has nothing to rebuild.
+            conn.execute(_FTS_TABLE_SQL)
+            for statement in _FTS_TRIGGERS.values():
+                conn.execute(statement)
+
+            # Rebuild FTS index from existing projects. The table has external
+            # content, so FTS5 reads the rows from projects itself in one pass.
+            _rebuild_fts(conn)
+            schema["projects_fts"] = set(_FTS_COLUMNS)
+
+
+def migration_add_arrangement_duration(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
     """Add arrangement_duration_seconds column to projects table."""
-    with engine.connect() as conn:
-        # Check existing columns
-        result = conn.execute(text("PRAGMA table_info(projects)"))
-        project_columns = [row[1] for row in result.fetchall()]
-
-        if "arrangement_duration_seconds" not in project_columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN arrangement_duration_seconds REAL"))
-            conn.commit()
-
-            # Calculate duration for existing projects that have bars and tempo
-            conn.execute(text("""
-                UPDATE projects
-                SET arrangement_duration_seconds = (arrangement_length * 4.0 / tempo) * 60.0
-                WHERE arrangement_length IS NOT NULL
-                  AND arrangement_length > 0
-                  AND tempo IS NOT NULL
-                  AND tempo > 0
-            """))
-            conn.commit()
+    if schema is None:
+        schema = _snapshot_columns(conn, ["projects"])
+    if _add_column(conn, schema, "projects", "arrangement_duration_seconds", "REAL"):
+        # Calculate duration for existing projects that have bars and tempo
+        conn.exec_driver_sql("""
+            UPDATE projects
+            SET arrangement_duration_seconds = (arrangement_length * 4.0 / tempo) * 60.0
+            WHERE arrangement_length IS NOT NULL
+              AND arrangement_length > 0
+              AND tempo IS NOT NULL
+              AND tempo > 0
+        """)
 
 
-def migration_add_live_installations(engine: Engine) -> None:
+def migration_add_live_installations(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
     """Add live_installations table for storing Live installations."""
-    with engine.connect() as conn:
-        # Check if table already exists
-        result = conn.execute(
-            text("SELECT name FROM sqlite_master WHERE type='table' AND name='live_installations'")
+    # Create live_installations table (create_all() may already have made it)
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS live_installations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name VARCHAR(255) NOT NULL,
+            version VARCHAR(50) NOT NULL,
+            executable_path VARCHAR(1024) NOT NULL UNIQUE,
+            build VARCHAR(50),
+            is_suite BOOLEAN DEFAULT 0,
+            is_favorite BOOLEAN DEFAULT 0,
+            is_auto_detected BOOLEAN DEFAULT 0,
+            notes TEXT,
+            created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            modified_date DATETIME DEFAULT CURRENT_TIMESTAMP
         )
-        if result.fetchone() is not None:
-            return  # Table already exists
-
-        # Create live_installations table
-        conn.execute(text("""
-            CREATE TABLE live_installations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name VARCHAR(255) NOT NULL,
-                version VARCHAR(50) NOT NULL,
-                executable_path VARCHAR(1024) NOT NULL UNIQUE,
-                build VARCHAR(50),
-                is_suite BOOLEAN DEFAULT 0,
-                is_favorite BOOLEAN DEFAULT 0,
-                is_auto_detected BOOLEAN DEFAULT 0,
-                notes TEXT,
-                created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                modified_date DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """))
+    """)
 
-        # Create index for favorite lookups
-        conn.execute(text("""
-            CREATE INDEX idx_live_installation_favorite ON live_installations(is_favorite)
-        """))
-
-        conn.commit()
+    # Create index for favorite lookups
+    conn.exec_driver_sql("""
+        CREATE INDEX IF NOT EXISTS idx_live_installation_favorite
+        ON live_installations(is_favorite)
+    """)
 
 
-def migration_add_musical_key_fields(engine: Engine) -> None:
+def migration_add_musical_key_fields(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
     """Add musical_key, scale_type, and is_in_key fields to projects table."""
-    with engine.connect() as conn:
-        # Check if musical_key column already exists
-        result = conn.execute(text("PRAGMA table_info(projects)"))
-        columns = [row[1] for row in result.fetchall()]
+    _add_columns(conn, schema, 8)
 
-        if "musical_key" not in columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN musical_key VARCHAR(10)"))
 
-        if "scale_type" not in columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN scale_type VARCHAR(50)"))
+def migration_add_export_id_to_project_collections(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Add export_id column to project_collections table."""
+    _add_columns(conn, schema, 9)
 
-        if "is_in_key" not in columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN is_in_key BOOLEAN"))
 
-        conn.commit()
+def migration_add_artist_name_to_collections(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Add artist_name column to collections table."""
+    _add_columns(conn, schema, 10)
 
 
-def migration_add_export_id_to_project_collections(engine: Engine) -> None:
-    """Add export_id column to project_collections table."""
-    with engine.connect() as conn:
-        # Check if export_id column already exists
-        result = conn.execute(text("PRAGMA table_info(project_collections)"))
-        columns = [row[1] for row in result.fetchall()]
-
-        if "export_id" not in columns:
-            conn.execute(
-                text(
-                    "ALTER TABLE project_collections "
-                    "ADD COLUMN export_id INTEGER REFERENCES exports(id)"
-                )
+def migration_add_check_constraints(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Add CHECK constraints for data validation (Phase 1)."""
+    # SQLite doesn't support adding CHECK constraints via ALTER TABLE
+    # We need to recreate tables with constraints, but that's complex
+    # Instead, we'll rely on application-level validation
+    # Note: SQLite will enforce CHECK constraints on new inserts/updates
+    # but existing invalid data won't be caught until modified
+
+    # For now, we'll just verify the constraints exist in the schema
+    # The actual constraints are defined in the models.py CheckConstraint
+    # SQLAlchemy will create them when tables are created
+
+
+# Point collection tracks at the kept export of a duplicated path, then drop
+# the other exports; both run once per duplicated path (:path, :keep_id)
+_MERGE_EXPORT_REFERENCES_SQL = text("""
+    UPDATE project_collections SET export_id = :keep_id
+    WHERE export_id IN (
+        SELECT id FROM exports WHERE export_path = :path AND id != :keep_id
+    )
+""")
+_DELETE_DUPLICATE_EXPORTS_SQL = text(
+    "DELETE FROM exports WHERE export_path = :path AND id != :keep_id"
+)
+
+
+def migration_add_unique_export_path(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Add unique constraint on exports.export_path (Phase 1)."""
+    # Check if unique constraint already exists
+    result = conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='exports'"
+    )
+    table_sql = result.fetchone()
+
+    if table_sql and "UNIQUE" not in table_sql[0].upper():
+        # SQLite doesn't support adding UNIQUE constraint via ALTER TABLE
+        # We need to recreate the table, but first check for duplicates.
+        # One pass finds the export to keep (the oldest) for every duplicated path.
+        result = conn.exec_driver_sql("""
+            SELECT export_path, id FROM (
+                SELECT export_path, id,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY export_path ORDER BY created_date, id
+                       ) AS position,
+                       COUNT(*) OVER (PARTITION BY export_path) AS copies
+                FROM exports
             )
-            conn.commit()
+            WHERE position = 1 AND copies > 1
+        """)
+        duplicates = [{"path": export_path, "keep_id": keep_id} for export_path, keep_id in result]
+
+        if duplicates:
+            # Handle duplicates by keeping the first one and updating references,
+            # each statement batched over every duplicated path
+            conn.execute(_MERGE_EXPORT_REFERENCES_SQL, duplicates)
+
+            # Delete duplicate exports
+            conn.execute(_DELETE_DUPLICATE_EXPORTS_SQL, duplicates)
+
+        # Now recreate table with unique constraint
+        # This is complex, so we'll use a workaround: create unique index
+        # SQLite will enforce uniqueness via index
+        try:
+            conn.exec_driver_sql(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_export_path_unique "
+                "ON exports(export_path)"
+            )
+        except Exception:
+            # Index might already exist or constraint violation
+            pass
 
 
-def migration_add_artist_name_to_collections(engine: Engine) -> None:
-    """Add artist_name column to collections table."""
-    with engine.connect() as conn:
-        # Check if artist_name column already exists
-        result = conn.execute(text("PRAGMA table_info(collections)"))
-        columns = [row[1] for row in result.fetchall()]
+# (table, DDL) for each composite index migration 13 adds
+_COMPOSITE_INDEXES = (
+    (
+        "projects",
+        "CREATE INDEX IF NOT EXISTS idx_project_location_status ON projects(location_id, status)",
+    ),
+    (
+        "projects",
+        "CREATE INDEX IF NOT EXISTS idx_project_favorite_modified "
+        "ON projects(is_favorite, modified_date)",
+    ),
+    (
+        "project_collections",
+        "CREATE INDEX IF NOT EXISTS idx_project_collection_track "
+        "ON project_collections(collection_id, track_number)",
+    ),
+    (
+        "exports",
+        "CREATE INDEX IF NOT EXISTS idx_export_project_date ON exports(project_id, export_date)",
+    ),
+    (
+        "collections",
+        "CREATE INDEX IF NOT EXISTS idx_collection_type ON collections(collection_type)",
+    ),
+    ("projects", "CREATE INDEX IF NOT EXISTS idx_project_rating ON projects(rating)"),
+)
 
-        if "artist_name" not in columns:
-            conn.execute(text("ALTER TABLE collections ADD COLUMN artist_name VARCHAR(255)"))
-            conn.commit()
 
+def migration_add_composite_indexes(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Add composite indexes for common query patterns (Phase 1 & 2)."""
+    # All or nothing: if one index can't be created, the savepoint drops the
+    # ones created before it instead of leaving half the set behind
+    try:
+        with conn.begin_nested():
+            for _table_name, statement in _COMPOSITE_INDEXES:
+                conn.exec_driver_sql(statement)
+    except Exception:
+        # Schema predates an indexed column; queries still work without them
+        pass
 
-def migration_add_check_constraints(engine: Engine) -> None:
-    """Add CHECK constraints for data validation (Phase 1)."""
-    with engine.connect() as conn:
-        # SQLite doesn't support adding CHECK constraints via ALTER TABLE
-        # We need to recreate tables with constraints, but that's complex
-        # Instead, we'll rely on application-level validation
-        # Note: SQLite will enforce CHECK constraints on new inserts/updates
-        # but existing invalid data won't be caught until modified
-
-        # For now, we'll just verify the constraints exist in the schema
-        # The actual constraints are defined in the models.py CheckConstraint
-        # SQLAlchemy will create them when tables are created
-        conn.commit()
+    # Gather statistics for the indexed tables, so the query planner knows when
+    # the new composite indexes beat the existing single-column ones
+    for table_name in dict.fromkeys(table_name for table_name, _statement in _COMPOSITE_INDEXES):
+        conn.exec_driver_sql(f"ANALYZE {table_name}")
 
 
-def migration_add_unique_export_path(engine: Engine) -> None:
-    """Add unique constraint on exports.export_path (Phase 1)."""
-    with engine.connect() as conn:
-        # Check if unique constraint already exists
-        result = conn.execute(
-            text("SELECT sql FROM sqlite_master WHERE type='table' AND name='exports'")
-        )
-        table_sql = result.fetchone()
-
-        if table_sql and "UNIQUE" not in table_sql[0].upper():
-            # SQLite doesn't support adding UNIQUE constraint via ALTER TABLE
-            # We need to recreate the table, but first check for duplicates
-            result = conn.execute(
-                text(
-                    "SELECT export_path, COUNT(*) as cnt FROM exports "
-                    "GROUP BY export_path HAVING cnt > 1"
-                )
-            )
-            duplicates = result.fetchall()
-
-            if duplicates:
-                # Handle duplicates by keeping the first one and updating references
-                for export_path, _count in duplicates:
-                    result = conn.execute(
-                        text(
-                            "SELECT id FROM exports WHERE export_path = :path "
-                            "ORDER BY created_date LIMIT 1"
-                        ),
-                        {"path": export_path},
-                    )
-                    keep_id = result.fetchone()[0]
-
-                    # Update project_collections to use the kept export
-                    conn.execute(
-                        text(
-                            "UPDATE project_collections SET export_id = :keep_id "
-                            "WHERE export_id IN ("
-                            "    SELECT id FROM exports "
-                            "    WHERE export_path = :path AND id != :keep_id"
-                            ")"
-                        ),
-                        {"keep_id": keep_id, "path": export_path},
-                    )
-
-                    # Delete duplicate exports
-                    conn.execute(
-                        text("DELETE FROM exports WHERE export_path = :path AND id != :keep_id"),
-                        {"keep_id": keep_id, "path": export_path},
-                    )
-
-            # Now recreate table with unique constraint
-            # This is complex, so we'll use a workaround: create unique index
-            # SQLite will enforce uniqueness via index
-            try:
-                conn.execute(
-                    text(
-                        "CREATE UNIQUE INDEX IF NOT EXISTS idx_export_path_unique "
-                        "ON exports(export_path)"
-                    )
-                )
-            except Exception:
-                # Index might already exist or constraint violation
-                pass
+def _parse_tag_ids(tags_json: Any) -> list[int]:
+    """Read the integer tag ids from a project's JSON tags column.
 
-        conn.commit()
+    Args:
+        tags_json: Stored tags value, normally a JSON array of tag ids.
 
+    Returns:
+        The integer ids in the array; empty for invalid JSON or a non-list.
+    """
+    try:
+        tag_ids = json.loads(tags_json) if isinstance(tags_json, str) else tags_json
+    except ValueError:
+        return []
+    if not isinstance(tag_ids, list):
+        return []
+    return [tag_id for tag_id in tag_ids if isinstance(tag_id, int)]
 
-def migration_add_composite_indexes(engine: Engine) -> None:
-    """Add composite indexes for common query patterns (Phase 1 & 2)."""
-    with engine.connect() as conn:
-        indexes = [
-            ("idx_project_location_status", "projects", "(location_id, status)"),
-            ("idx_project_favorite_modified", "projects", "(is_favorite, modified_date)"),
-            (
-                "idx_project_collection_track",
-                "project_collections",
-                "(collection_id, track_number)",
-            ),
-            ("idx_export_project_date", "exports", "(project_id, export_date)"),
-            ("idx_collection_type", "collections", "(collection_type)"),
-            ("idx_project_rating", "projects", "(rating)"),
-        ]
-
-        for index_name, table_name, columns in indexes:
-            try:
-                conn.execute(
-                    text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}{columns}")
-                )
-            except Exception:
-                # Index might already exist
-                pass
 
-        conn.commit()
+_INSERT_PROJECT_TAG_SQL = text(
+    "INSERT OR IGNORE INTO project_tags (project_id, tag_id) VALUES (:project_id, :tag_id)"
+)
 
 
-def migration_create_project_tags_table(engine: Engine) -> None:
+def migration_create_project_tags_table(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
     """Create project_tags junction table for tag normalization (Phase 2)."""
-    with engine.connect() as conn:
-        # Check if table already exists
-        result = conn.execute(
-            text("SELECT name FROM sqlite_master WHERE type='table' AND name='project_tags'")
-        )
-        if result.fetchone() is not None:
-            return  # Table already exists
-
-        # Create project_tags table
-        conn.execute(text("""
-            CREATE TABLE project_tags (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
-                tag_id INTEGER NOT NULL REFERENCES tags(id) ON DELETE CASCADE,
-                created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(project_id, tag_id)
-            )
-        """))
-
-        # Create indexes
-        conn.execute(text("CREATE INDEX idx_project_tags_project ON project_tags(project_id)"))
-        conn.execute(text("CREATE INDEX idx_project_tags_tag ON project_tags(tag_id)"))
-
-        # Migrate existing JSON tags data
-        # Get all projects with tags
-        result = conn.execute(
-            text(
-                "SELECT id, tags FROM projects "
-                "WHERE tags IS NOT NULL AND tags != '[]' AND tags != ''"
-            )
+    # Create project_tags table. init_database()'s create_all() makes it before
+    # migrations run, so an existing table doesn't mean the tags were copied:
+    # the backfill below runs either way and skips pairs already present.
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS project_tags (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+            tag_id INTEGER NOT NULL REFERENCES tags(id) ON DELETE CASCADE,
+            created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(project_id, tag_id)
         )
-        projects_with_tags = result.fetchall()
-
-        migrated_count = 0
-        for project_id, tags_json in projects_with_tags:
-            try:
-                import json
-
-                tag_ids = json.loads(tags_json) if isinstance(tags_json, str) else tags_json
-                if isinstance(tag_ids, list):
-                    for tag_id in tag_ids:
-                        if isinstance(tag_id, int):
-                            # Check if tag exists
-                            tag_check = conn.execute(
-                                text("SELECT id FROM tags WHERE id = :tag_id"), {"tag_id": tag_id}
-                            )
-                            if tag_check.fetchone():
-                                # Insert into project_tags (ignore if already exists)
-                                try:
-                                    conn.execute(
-                                        text("""
-                                        INSERT INTO project_tags (project_id, tag_id)
-                                        VALUES (:project_id, :tag_id)
-                                    """),
-                                        {"project_id": project_id, "tag_id": tag_id},
-                                    )
-                                    migrated_count += 1
-                                except Exception:
-                                    # Already exists, skip
-                                    pass
-            except Exception:
-                # Skip projects with invalid JSON
-                continue
-
-        conn.commit()
-        print(f"Migrated {migrated_count} tag relationships to project_tags table")
-
-
-def migration_update_foreign_key_cascades(engine: Engine) -> None:
+    """)
+
+    # Create indexes
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS idx_project_tags_project ON project_tags(project_id)"
+    )
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_project_tags_tag ON project_tags(tag_id)")
+
+    # Migrate existing JSON tags data: one query for the valid tag ids, one
+    # streamed pass over the projects, and a single batched insert
+    valid_tag_ids = {row[0] for row in conn.exec_driver_sql("SELECT id FROM tags")}
+    result = conn.exec_driver_sql(
+        "SELECT id, tags FROM projects WHERE tags IS NOT NULL AND tags != '[]' AND tags != ''"
+    )
+
+    # Keyed by (project_id, tag_id) so a tag repeated in one list is inserted once
+    rows = {}
+    for project_id, tags_json in result:
+        for tag_id in _parse_tag_ids(tags_json):
+            if tag_id in valid_tag_ids:
+                rows[(project_id, tag_id)] = {"project_id": project_id, "tag_id": tag_id}
+
+    if rows:
+        conn.execute(_INSERT_PROJECT_TAG_SQL, list(rows.values()))
+    migrated_count = len(rows)
+
+    logger.info(f"Migrated {migrated_count} tag relationships to project_tags table")
+
+
+def migration_update_foreign_key_cascades(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
     """Update foreign key cascade behaviors (Phase 2).
 
     Note: SQLite doesn't support modifying foreign keys via ALTER TABLE.
     The cascade behaviors are defined in models.py and will be applied
     when tables are recreated. This migration verifies the constraints.
     """
-    with engine.connect() as conn:
-        # SQLite foreign key constraints are enforced via PRAGMA foreign_keys=ON
-        # which is already enabled in db.py
-        # The actual cascade behaviors are defined in the models
-        # We can't modify them without recreating tables, so we'll just verify
-        conn.commit()
+    # SQLite foreign key constraints are enforced via PRAGMA foreign_keys=ON
+    # which is already enabled in db.py
+    # The actual cascade behaviors are defined in the models
+    # We can't modify them without recreating tables, so we'll just verify
 
 
-def migration_add_timeline_markers(engine: Engine) -> None:
-    """Add timeline_markers column to projects table.
+def migration_add_scan_metadata_columns(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Add the columns scanning fills from .als files to the projects table.
 
-    Stores timeline markers (locators) extracted from .als files using dawtool.
-    Format: JSON array of objects with 'time' (float) and 'text' (string) fields.
+    Versions 16, 17 and 18 each added some of these columns and always run
+    back to back on an upgrade, so all three point here: the first adds every
+    missing column and records it in the snapshot, the others find nothing
+    left to do.
     """
-    with engine.connect() as conn:
-        # Check if column already exists
-        result = conn.execute(text("PRAGMA table_info(projects)"))
-        columns = [row[1] for row in result.fetchall()]
+    _add_columns(conn, schema, 16)
 
-        if "timeline_markers" not in columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN timeline_markers TEXT DEFAULT '[]'"))
-            conn.commit()
 
+def migration_add_sample_length_fields(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Add furthest_sample_end and sample_duration_seconds columns to projects table.
 
-def migration_add_feature_vector(engine: Engine) -> None:
-    """Add feature_vector column to projects table.
+    Separates session clip lengths (recorded samples) from arrangement material.
+    Previously, arrangement_length included ALL clips (arrangement + session),
+    which inflated the reported length when samples existed in session view.
 
-    Stores pre-computed ML feature vectors for similarity analysis.
-    Computed during project scanning so similarity comparisons don't
-    require re-parsing ALS files.
+    Also clears stale arrangement_length/arrangement_duration_seconds and
+    resets last_parsed so projects are re-parsed with the corrected logic.
     """
-    with engine.connect() as conn:
-        result = conn.execute(text("PRAGMA table_info(projects)"))
-        columns = [row[1] for row in result.fetchall()]
+    _add_columns(conn, schema, 19)
+
+    # Clear stale arrangement_length values that included session clips,
+    # and reset last_parsed so the next scan re-parses with corrected logic
+    conn.exec_driver_sql("""
+        UPDATE projects
+        SET arrangement_length = NULL,
+            arrangement_duration_seconds = NULL,
+            last_parsed = NULL
+    """)
+
+
+def migration_add_fts_prefix_index(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Recreate the FTS table with prefix indexes.
+
+    Search runs "term"* prefix queries on every keystroke. Without a prefix
+    index FTS5 has to walk every indexed term that starts with the prefix;
+    with one, short prefixes resolve to a single index lookup. The content
+    lives in the projects table, so the index is rebuilt from there.
+    """
+    from .db import _FTS_TABLE_SQL, _rebuild_fts
 
-        if "feature_vector" not in columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN feature_vector TEXT"))
-            conn.commit()
+    result = conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='projects_fts'"
+    )
+    row = result.fetchone()
 
+    # New databases get the prefix index from _create_fts_table()
+    if row is None or "prefix=" in row[0]:
+        return
 
-def migration_add_als_metadata_fields(engine: Engine) -> None:
-    """Add export_filenames, annotation, master_track_name columns to projects table.
+    # The sync triggers are on projects, so they survive the drop
+    conn.exec_driver_sql("DROP TABLE projects_fts")
+    conn.execute(_FTS_TABLE_SQL)
+    _rebuild_fts(conn)
 
-    These fields are extracted from .als files during scanning so that viewing
-    project properties does not require re-parsing the ALS file.
+
+def migration_simplify_fts_triggers(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Recreate the FTS sync triggers without the COALESCE wrappers.
+
+    FTS5's tokenizer produces no tokens for either NULL or '[]', so
+    COALESCE(plugins, '[]') only cost extra work on every project write.
     """
-    with engine.connect() as conn:
-        result = conn.execute(text("PRAGMA table_info(projects)"))
-        columns = [row[1] for row in result.fetchall()]
-
-        if "export_filenames" not in columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN export_filenames TEXT"))
-        if "annotation" not in columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN annotation TEXT"))
-        if "master_track_name" not in columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN master_track_name VARCHAR(255)"))
-        conn.commit()
+    from .db import _FTS_TRIGGERS
 
+    result = conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='projects_fts'"
+    )
 
-def migration_add_sample_length_fields(engine: Engine) -> None:
-    """Add furthest_sample_end and sample_duration_seconds columns to projects table.
+    # New databases get the current triggers from _create_fts_table()
+    if result.fetchone() is None:
+        return
 
-    Separates session clip lengths (recorded samples) from arrangement material.
-    Previously, arrangement_length included ALL clips (arrangement + session),
-    which inflated the reported length when samples existed in session view.
+    for name, statement in _FTS_TRIGGERS.items():
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(statement)
 
-    Also clears stale arrangement_length/arrangement_duration_seconds and
-    resets last_parsed so projects are re-parsed with the corrected logic.
-    """
-    with engine.connect() as conn:
-        result = conn.execute(text("PRAGMA table_info(projects)"))
-        columns = [row[1] for row in result.fetchall()]
 
-        if "furthest_sample_end" not in columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN furthest_sample_end REAL"))
+# Partial indexes migration 22 puts in place of the full-column ones, matching
+# the definitions in models.py: name -> (table, DDL)
+_PARTIAL_INDEXES = {
+    "idx_project_favorite_modified": (
+        "projects",
+        "CREATE INDEX IF NOT EXISTS idx_project_favorite_modified ON projects (modified_date) "
+        "WHERE is_favorite = 1",
+    ),
+    "idx_location_active": (
+        "locations",
+        "CREATE INDEX IF NOT EXISTS idx_location_active ON locations (name) WHERE is_active = 1",
+    ),
+}
 
-        if "sample_duration_seconds" not in columns:
-            conn.execute(text("ALTER TABLE projects ADD COLUMN sample_duration_seconds REAL"))
 
-        # Clear stale arrangement_length values that included session clips,
-        # and reset last_parsed so the next scan re-parses with corrected logic
-        conn.execute(text("""
-            UPDATE projects
-            SET arrangement_length = NULL,
-                arrangement_duration_seconds = NULL,
-                last_parsed = NULL
-        """))
+def migration_add_partial_indexes(
+    conn: Connection, schema: dict[str, set[str]] | None = None
+) -> None:
+    """Replace the favorite and active-location indexes with partial ones.
 
-        conn.commit()
+    Almost every project isn't a favorite, so indexing only favorites keeps
+    idx_project_favorite_modified small; it serves the favorites filter on
+    its own, so idx_project_favorite is dropped. Almost every location is
+    active, so idx_location_active isn't much smaller than a full index; its
+    gain is being on name, which covers get_all()'s ORDER BY name. Indexes
+    that migration 13 skipped are created here too.
+    """
+    conn.exec_driver_sql("DROP INDEX IF EXISTS idx_project_favorite")
+
+    # One read answers both which indexes exist and which tables they need
+    names = ", ".join(f"'{name}'" for name in _PARTIAL_INDEXES)
+    tables = ", ".join(f"'{table}'" for table, _ in _PARTIAL_INDEXES.values())
+    result = conn.exec_driver_sql(
+        f"SELECT name, sql FROM sqlite_master WHERE (type='index' AND name IN ({names})) "
+        f"OR (type='table' AND name IN ({tables}))"
+    )
+    existing = dict(result.fetchall())
+
+    for name, (table, sql) in _PARTIAL_INDEXES.items():
+        # New databases get the partial indexes from create_all()
+        if name in existing:
+            if "WHERE" in existing[name].upper():
+                continue
+            conn.exec_driver_sql(f"DROP INDEX {name}")
+        elif table not in existing:
+            continue
+        conn.exec_driver_sql(sql)
 
 
 # Migration registry - add new migrations here
-# Each migration is a tuple of (version, description, function)
+# Each migration is a tuple of (version, description, function). Functions take
+# run_migrations()'s connection, inside its transaction, and the column snapshot
+# it reads up front; called with schema=None they read the columns themselves.
 # NOTE: Must be defined AFTER the migration functions
 MIGRATIONS: list[tuple] = [
     # (1, "Initial schema", None),  # Initial schema handled by create_all
@@ -645,20 +670,30 @@ MIGRATIONS: list[tuple] = [
         migration_create_project_tags_table,
     ),
     (15, "Update foreign key cascade behaviors (Phase 2)", migration_update_foreign_key_cascades),
-    (16, "Add timeline_markers column to projects table", migration_add_timeline_markers),
-    (17, "Add feature_vector column to projects table", migration_add_feature_vector),
+    (16, "Add timeline_markers column to projects table", migration_add_scan_metadata_columns),
+    (17, "Add feature_vector column to projects table", migration_add_scan_metadata_columns),
     (
         18,
         "Add ALS metadata fields (export_filenames, annotation, master_track_name)",
-        migration_add_als_metadata_fields,
+        migration_add_scan_metadata_columns,
     ),
     (
         19,
         "Add sample length fields (furthest_sample_end, sample_duration_seconds)",
         migration_add_sample_length_fields,
     ),
+    (20, "Add prefix indexes to the projects FTS table", migration_add_fts_prefix_index),
+    (21, "Drop COALESCE from the FTS sync triggers", migration_simplify_fts_triggers),
+    (22, "Make the favorite and active-location indexes partial", migration_add_partial_indexes),
 ]
 
+# Newest schema version; run_migrations() returns early once a database is there
+LATEST_VERSION = max(version for version, _description, _func in MIGRATIONS)
+
+# Engines whose database run_migrations() has already found or brought up to
+# date in this process; later calls skip the schema_version query entirely
+_up_to_date_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
 
 def get_schema_version(engine: Engine) -> int:
     """Get the current schema version from the database.
@@ -670,76 +705,125 @@ def get_schema_version(engine: Engine) -> int:
         Current schema version number (0 if not set).
     """
     with engine.connect() as conn:
-        # Check if schema_version table exists
-        result = conn.execute(
-            text("SELECT name FROM sqlite_master WHERE type='table' AND name='schema_version'")
-        )
-        if result.fetchone() is None:
-            # Create schema version table
-            conn.execute(text("""
-                CREATE TABLE schema_version (
-                    version INTEGER PRIMARY KEY,
-                    applied_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                    description TEXT
-                )
-            """))
-            conn.execute(
-                text(
-                    "INSERT INTO schema_version (version, description) VALUES (1, 'Initial schema')"
-                )
+        # Every launch after the first finds the table, so read the version
+        # straight away rather than probing sqlite_master for the table first
+        try:
+            version = conn.exec_driver_sql("SELECT MAX(version) FROM schema_version").scalar()
+            return version or 1
+        except OperationalError as e:
+            if "no such table" not in str(e):
+                raise
+
+        # Create schema version table. IF NOT EXISTS and OR IGNORE let another
+        # process that got here first win the race without an error.
+        conn.exec_driver_sql("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                applied_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                description TEXT
             )
-            conn.commit()
-            return 1
+        """)
+        conn.exec_driver_sql(
+            "INSERT OR IGNORE INTO schema_version (version, description) "
+            "VALUES (1, 'Initial schema')"
+        )
+        conn.commit()
+        return 1
+
 
-        # Get current version
-        result = conn.execute(text("SELECT MAX(version) FROM schema_version"))
-        row = result.fetchone()
-        return row[0] if row and row[0] else 1
+_INSERT_SCHEMA_VERSION_SQL = text(
+    "INSERT INTO schema_version (version, description) VALUES (:version, :description)"
+)
 
 
-def set_schema_version(engine: Engine, version: int, description: str) -> None:
+def set_schema_version(conn: Connection, version: int, description: str) -> None:
     """Record a schema version in the database.
 
     Args:
-        engine: SQLAlchemy engine.
+        conn: Connection inside the migration transaction.
         version: Version number to record.
         description: Description of the migration.
     """
-    with engine.connect() as conn:
-        conn.execute(
-            text(
-                "INSERT INTO schema_version (version, description) VALUES (:version, :description)"
-            ),
-            {"version": version, "description": description},
-        )
-        conn.commit()
+    conn.execute(_INSERT_SCHEMA_VERSION_SQL, {"version": version, "description": description})
+
+
+# Connection settings for the duration of an upgrade, restored afterwards.
+# The migrations keep their references consistent themselves, so foreign keys
+# are off to skip the parent-row lookups on every row they copy and the
+# cascades on every row they drop. The FTS rebuild, the tag backfill and the
+# index builds sort through temp b-trees, which stay in memory with a larger
+# page cache (200MB) than the app runs with day to day.
+_MIGRATION_PRAGMAS = {
+    "foreign_keys": "OFF",
+    "temp_store": "MEMORY",
+    "cache_size": "-200000",
+}
 
 
 def run_migrations(engine: Engine) -> None:
     """Run any pending database migrations.
 
+    All pending migrations run in one write transaction on one connection, so
+    an upgrade costs a single commit and a failure in any migration leaves the
+    database at the version it started from.
+
     Args:
         engine: SQLAlchemy engine.
     """
+    if engine in _up_to_date_engines:
+        return
+
     current_version = get_schema_version(engine)
+    if current_version >= LATEST_VERSION:
+        _up_to_date_engines.add(engine)
+        return
 
-    for version, description, migration_func in MIGRATIONS:
-        if version > current_version and migration_func is not None:
-            print(f"Running migration {version}: {description}")
-            try:
-                migration_func(engine)
-                set_schema_version(engine, version, description)
-                print(f"Migration {version} completed successfully")
-            except Exception as e:
-                print(f"Migration {version} failed: {e}")
-                raise
+    pending = [
+        (version, description, migration_func)
+        for version, description, migration_func in MIGRATIONS
+        if version > current_version and migration_func is not None
+    ]
+
+    with engine.connect() as conn:
+        # Set outside the transaction, where foreign_keys can be switched
+        saved_pragmas = {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar() for name in _MIGRATION_PRAGMAS
+        }
+        for name, value in _MIGRATION_PRAGMAS.items():
+            conn.exec_driver_sql(f"PRAGMA {name}={value}")
+        try:
+            # IMMEDIATE takes the write lock up front
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+            # Each checked table's columns are read once, when first needed,
+            # instead of once per migration. _add_column() records every
+            # column it adds, keeping the snapshot accurate for later checks.
+            schema = _ColumnSnapshot(conn)
+
+            for version, description, migration_func in pending:
+                logger.info(f"Running migration {version}: {description}")
+                try:
+                    migration_func(conn, schema)
+                    set_schema_version(conn, version, description)
+                    logger.debug(f"Migration {version} completed successfully")
+                except Exception as e:
+                    logger.error(f"Migration {version} failed: {e}", exc_info=True)
+                    raise
+
+            conn.commit()
+            _up_to_date_engines.add(engine)
+        finally:
+            # Undo everything if a migration failed (a no-op after commit), then
+            # put the pooled connection back the way it was handed out
+            conn.rollback()
+            for name, value in saved_pragmas.items():
+                conn.exec_driver_sql(f"PRAGMA {name}={value}")
 
 
 # Example migration function template:
-# def migration_add_duration(engine: Engine) -> None:
+# def migration_add_duration(conn: Connection, schema: dict[str, set[str]] | None = None) -> None:
 #     """Add duration column to projects table."""
-#     with engine.connect() as conn:
-#         conn.execute(text(
-#             "ALTER TABLE projects ADD COLUMN duration_seconds REAL"
-#         ))
-#         conn.commit()
+#     if schema is None:
+#         schema = _snapshot_columns(conn, ["projects"])
+#     if "duration_seconds" not in schema["projects"]:
+#         conn.exec_driver_sql("ALTER TABLE projects ADD COLUMN duration_seconds REAL")
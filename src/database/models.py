@@ -22,9 +22,65 @@ from sqlalchemy import (
 )
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.types import TypeDecorator
+
+from ..utils.logging import get_logger
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = get_logger(__name__)
 
 Base = declarative_base()
 
+# Major version in an ableton_version string like "Ableton Live 11.3.10"
+_LIVE_VERSION_RE = re.compile(r"Live\s+(\d+)")
+# Beta/rc suffix of a version part, e.g. the "b1" in "12b1"
+_BETA_SUFFIX_RE = re.compile(r"[a-zA-Z].*$")
+
+
+def _decode_json_text(value: str) -> Any:
+    """Decode JSON text, treating an empty string as no value."""
+    if not value:
+        return None
+    return orjson.loads(value) if ORJSON_AVAILABLE else json.loads(value)
+
+
+class JSONList(TypeDecorator):
+    """JSON column for the lists extracted from .als files.
+
+    Older scans assigned json.dumps() output to these columns, which the JSON
+    type stored as a JSON string holding the encoded list. Such rows are
+    decoded once here on load, and JSON text assigned now is stored as the
+    value it encodes, so the getters on Project never see a string. Assigned
+    text that is not valid JSON is stored unchanged; on load it is logged and
+    treated as NULL rather than failing the whole query.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        if isinstance(value, str):
+            try:
+                return _decode_json_text(value)
+            except ValueError:
+                return value
+        return value
+
+    def process_result_value(self, value: Any, dialect: Any) -> Any:
+        if isinstance(value, str):
+            try:
+                return _decode_json_text(value)
+            except ValueError as e:
+                logger.warning(f"Ignoring malformed JSON list value {value[:80]!r}: {e}")
+                return None
+        return value
+
 
 class LocationType(StrEnum):
     """Types of project locations."""
@@ -219,8 +275,8 @@ class Project(Base):
     color = Column(String(7), nullable=True)
 
     # Project metadata (extracted from .als file)
-    plugins = Column(JSON, default=list)  # List of plugin names/paths
-    devices = Column(JSON, default=list)  # List of Ableton device names
+    plugins = Column(JSONList, default=list)  # List of plugin names/paths
+    devices = Column(JSONList, default=list)  # List of Ableton device names
     tempo = Column(Float, nullable=True)  # Project tempo in BPM
     time_signature = Column(String(10), nullable=True)  # e.g., "4/4", "3/4"
     track_count = Column(Integer, default=0)  # Total tracks
@@ -235,7 +291,7 @@ class Project(Base):
     furthest_sample_end = Column(Float, nullable=True)  # Longest session clip in bars
     sample_duration_seconds = Column(Float, nullable=True)  # Calculated sample duration in seconds
     ableton_version = Column(String(50), nullable=True)  # Version that created the set
-    sample_references = Column(JSON, default=list)  # List of sample file paths
+    sample_references = Column(JSONList, default=list)  # List of sample file paths
     has_automation = Column(Boolean, default=False)  # Has automation data
     last_parsed = Column(DateTime, nullable=True)  # When metadata was last extracted
 
@@ -246,14 +302,14 @@ class Project(Base):
 
     # Timeline markers (extracted from .als files using dawtool)
     timeline_markers = Column(
-        JSON, default=list
+        JSONList, default=list
     )  # List of timeline markers: [{"time": float, "text": str}]
 
     # ML feature vector (computed during scan for similarity analysis)
-    feature_vector = Column(JSON, nullable=True)  # List of floats for cosine similarity
+    feature_vector = Column(JSONList, nullable=True)  # List of floats for cosine similarity
 
     # ALS project metadata (extracted during scan to avoid re-parsing on view)
-    export_filenames = Column(JSON, nullable=True)  # Export filenames found in project file
+    export_filenames = Column(JSONList, nullable=True)  # Export filenames found in project file
     annotation = Column(Text, nullable=True)  # Project annotation/notes from ALS
     master_track_name = Column(String(255), nullable=True)  # Master track name
 
@@ -287,14 +343,10 @@ class Project(Base):
 
     def get_plugins_list(self) -> list[str]:
         """Get plugins as a Python list."""
-        if isinstance(self.plugins, str):
-            return json.loads(self.plugins) if self.plugins else []
         return self.plugins or []
 
     def get_devices_list(self) -> list[str]:
         """Get devices as a Python list."""
-        if isinstance(self.devices, str):
-            return json.loads(self.devices) if self.devices else []
         return self.devices or []
 
     def get_key_display(self) -> str | None:
@@ -319,7 +371,7 @@ class Project(Base):
             return None
 
         # Parse version string like "Ableton Live 11.3.10" or "Live 12.0.5"
-        match = re.search(r"Live\s+(\d+)", self.ableton_version)
+        match = _LIVE_VERSION_RE.search(self.ableton_version)
         if match:
             try:
                 major_version = int(match.group(1))
@@ -340,8 +392,6 @@ class Project(Base):
 
     def get_sample_references_list(self) -> list[str]:
         """Get sample references as a Python list."""
-        if isinstance(self.sample_references, str):
-            return json.loads(self.sample_references) if self.sample_references else []
         return self.sample_references or []
 
     def get_feature_vector_list(self) -> list[float] | None:
@@ -350,10 +400,6 @@ class Project(Base):
         Returns:
             List of float values, or None if no feature vector is stored.
         """
-        if self.feature_vector is None:
-            return None
-        if isinstance(self.feature_vector, str):
-            return json.loads(self.feature_vector) if self.feature_vector else None
         return self.feature_vector
 
     def get_timeline_markers_list(self) -> list[dict[str, Any]]:
@@ -362,8 +408,6 @@ class Project(Base):
         Returns:
             List of marker dicts with 'time' (float) and 'text' (str) keys.
         """
-        if isinstance(self.timeline_markers, str):
-            return json.loads(self.timeline_markers) if self.timeline_markers else []
         return self.timeline_markers or []
 
     def __repr__(self) -> str:
@@ -502,7 +546,7 @@ class LiveInstallation(Base):
                 # Get the first part and remove any beta suffix (e.g., "12b1" -> "12")
                 first_part = version_parts[0]
                 # Remove any trailing letters and digits (beta suffixes)
-                major_version_str = re.sub(r"[a-zA-Z].*$", "", first_part)
+                major_version_str = _BETA_SUFFIX_RE.sub("", first_part)
                 major_version = int(major_version_str)
                 if 9 <= major_version <= 12:
                     return major_version
@@ -578,14 +622,20 @@ Index("idx_project_location", Project.location_id)
 Index("idx_live_installation_favorite", LiveInstallation.is_favorite)
 Index("idx_project_name", Project.name)
 Index("idx_project_modified", Project.modified_date)
-Index("idx_project_favorite", Project.is_favorite)
-Index("idx_location_active", Location.is_active)
+# Partial: favorites and active locations are the only values filtered on,
+# so the indexes skip every other row. The WHERE must match the filters'
+# "= 1" form for SQLite to use them.
+Index("idx_location_active", Location.name, sqlite_where=Location.is_active == True)
 Index("idx_export_project", Export.project_id)
 Index("idx_app_settings_key", AppSettings.key)
 
 # Composite indexes for common query patterns (Phase 1 & 2)
 Index("idx_project_location_status", Project.location_id, Project.status)
-Index("idx_project_favorite_modified", Project.is_favorite, Project.modified_date)
+Index(
+    "idx_project_favorite_modified",
+    Project.modified_date,
+    sqlite_where=Project.is_favorite == True,
+)
 Index(
     "idx_project_collection_track", ProjectCollection.collection_id, ProjectCollection.track_number
 )
@@ -1,8 +1,10 @@
 """Repository for collection data access."""
 
+from sqlalchemy.orm import Session, selectinload
+
 from ...utils.logging import get_logger
-from ..db import get_session
-from ..models import Collection
+from ..db import session_scope
+from ..models import Collection, ProjectCollection
 
 
 class CollectionRepository:
@@ -12,50 +14,72 @@ class CollectionRepository:
         """Initialize the repository."""
         self.logger = get_logger(__name__)
 
-    def get_all(self) -> list[Collection]:
+    def get_all(self, session: Session | None = None) -> list[Collection]:
         """Get all collections.
 
+        Args:
+            session: Optional open session to use; the caller commits and closes it.
+
         Returns:
             List of Collection objects.
         """
-        session = get_session()
-        try:
+        with session_scope(session) as session:
             return session.query(Collection).order_by(Collection.name).all()
-        finally:
-            session.close()
 
-    def get_by_id(self, collection_id: int) -> Collection | None:
+    def get_by_id(self, collection_id: int, session: Session | None = None) -> Collection | None:
         """Get a collection by ID.
 
         Args:
             collection_id: Collection ID.
+            session: Optional open session to use; the caller commits and closes it.
 
         Returns:
             Collection object or None.
         """
-        session = get_session()
-        try:
+        with session_scope(session) as session:
             return session.query(Collection).filter(Collection.id == collection_id).first()
-        finally:
-            session.close()
 
-    def delete(self, collection_id: int) -> bool:
+    def get_with_projects(
+        self, collection_id: int, session: Session | None = None
+    ) -> Collection | None:
+        """Get a collection with its tracks and their projects loaded.
+
+        The tracks and their projects each come in one batched query, so
+        Collection.projects on the result doesn't query per track.
+
+        Args:
+            collection_id: Collection ID.
+            session: Optional open session to use; the caller commits and closes it.
+
+        Returns:
+            Collection object or None.
+        """
+        with session_scope(session) as session:
+            return (
+                session.query(Collection)
+                .options(
+                    selectinload(Collection.project_collections).selectinload(
+                        ProjectCollection.project
+                    )
+                )
+                .filter(Collection.id == collection_id)
+                .first()
+            )
+
+    def delete(self, collection_id: int, session: Session | None = None) -> bool:
         """Delete a collection.
 
         Args:
             collection_id: Collection ID to delete.
+            session: Optional open session to use; the caller commits and closes it.
 
         Returns:
             True if deleted successfully.
         """
-        session = get_session()
-        try:
+        with session_scope(session) as session:
             collection = session.query(Collection).filter(Collection.id == collection_id).first()
             if collection:
                 session.delete(collection)
-                session.commit()
                 self.logger.info(f"Deleted collection: {collection.name} (ID: {collection_id})")
                 return True
             return False
-        finally:
-            session.close()
@@ -1,8 +1,11 @@
 """Repository for location data access."""
 
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.orm import Session
+
 from ...utils.logging import get_logger
-from ..db import get_session
-from ..models import Location, Project, ProjectCollection
+from ..db import session_scope
+from ..models import Export, Location, Project, ProjectCollection, ProjectTag
 
 
 class LocationRepository:
@@ -12,51 +15,49 @@ class LocationRepository:
         """Initialize the repository."""
         self.logger = get_logger(__name__)
 
-    def get_all(self, active_only: bool = True) -> list[Location]:
+    def get_all(self, active_only: bool = True, session: Session | None = None) -> list[Location]:
         """Get all locations.
 
         Args:
             active_only: If True, only return active locations.
+            session: Optional open session to use; the caller commits and closes it.
 
         Returns:
             List of Location objects.
         """
-        session = get_session()
-        try:
+        with session_scope(session) as session:
             query = session.query(Location)
             if active_only:
                 query = query.filter(Location.is_active)
             return query.order_by(Location.name).all()
-        finally:
-            session.close()
 
-    def get_by_id(self, location_id: int) -> Location | None:
+    def get_by_id(self, location_id: int, session: Session | None = None) -> Location | None:
         """Get a location by ID.
 
         Args:
             location_id: Location ID.
+            session: Optional open session to use; the caller commits and closes it.
 
         Returns:
             Location object or None.
         """
-        session = get_session()
-        try:
+        with session_scope(session) as session:
             return session.query(Location).filter(Location.id == location_id).first()
-        finally:
-            session.close()
 
-    def delete(self, location_id: int, delete_projects: bool = False) -> bool:
+    def delete(
+        self, location_id: int, delete_projects: bool = False, session: Session | None = None
+    ) -> bool:
         """Delete a location.
 
         Args:
             location_id: Location ID to delete.
             delete_projects: If True, delete projects not in collections.
+            session: Optional open session to use; the caller commits and closes it.
 
         Returns:
             True if deleted successfully.
         """
-        session = get_session()
-        try:
+        with session_scope(session) as session:
             location = session.query(Location).filter(Location.id == location_id).first()
             if not location:
                 return False
@@ -64,24 +65,26 @@ class LocationRepository:
             location_name = location.name
 
             if delete_projects:
-                projects = session.query(Project).filter(Project.location_id == location_id).all()
-                deleted_count = 0
-                kept_count = 0
-
-                for project in projects:
-                    in_collection = (
-                        session.query(ProjectCollection)
-                        .filter(ProjectCollection.project_id == project.id)
-                        .first()
-                        is not None
-                    )
-
-                    if in_collection:
-                        project.location_id = None
-                        kept_count += 1
-                    else:
-                        session.delete(project)
-                        deleted_count += 1
+                # Set-based rather than per project: the location's projects
+                # outside any collection, with the exports and tag links the
+                # ORM cascade would have removed, go in one DELETE each
+                in_collection = exists().where(ProjectCollection.project_id == Project.id)
+                orphaned = (Project.location_id == location_id, ~in_collection)
+                orphaned_ids = select(Project.id).where(*orphaned)
+                session.execute(delete(Export).where(Export.project_id.in_(orphaned_ids)))
+                session.execute(delete(ProjectTag).where(ProjectTag.project_id.in_(orphaned_ids)))
+                deleted_count = session.execute(
+                    delete(Project).where(*orphaned),
+                    execution_options={"synchronize_session": False},
+                ).rowcount
+
+                # Whatever is left is in a collection, so keep it without a location
+                kept_count = session.execute(
+                    update(Project)
+                    .where(Project.location_id == location_id)
+                    .values(location_id=None),
+                    execution_options={"synchronize_session": False},
+                ).rowcount
 
                 if deleted_count > 0:
                     self.logger.info(f"Deleted {deleted_count} project(s) not in collections")
@@ -90,10 +93,12 @@ class LocationRepository:
                         f"Kept {kept_count} project(s) in collections (location cleared)"
                     )
 
+                # The bulk statements bypass the identity map, so a projects
+                # collection the session already loaded is stale. Reload it
+                # before the delete cascades through it.
+                session.expire(location, ["projects"])
+
             session.delete(location)
-            session.commit()
 
             self.logger.info(f"Removed location: {location_name} (ID: {location_id})")
             return True
-        finally:
-            session.close()
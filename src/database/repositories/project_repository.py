@@ -3,10 +3,10 @@
 from datetime import datetime, timedelta
 
 from sqlalchemy import String, nullsfirst, nullslast
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import Session, joinedload
 
 from ...utils.logging import get_logger
-from ..db import get_session
+from ..db import session_scope
 from ..models import Location, Project, ProjectCollection, ProjectTag
 
 
@@ -28,6 +28,7 @@ class ProjectRepository:
         tempo_max: int | None = None,
         sort_by: str = "modified_desc",
         arrangement_length: float | None = None,
+        session: Session | None = None,
     ) -> list[Project]:
         """Get projects with optional filtering and sorting.
 
@@ -41,12 +42,12 @@ class ProjectRepository:
             tempo_max: Maximum tempo filter.
             sort_by: Sort field and direction.
             arrangement_length: Optional arrangement length filter.
+            session: Optional open session to use; the caller commits and closes it.
 
         Returns:
             List of Project objects.
         """
-        session = get_session()
-        try:
+        with session_scope(session) as session:
             # Eagerly load relationships
             query = session.query(Project).options(
                 joinedload(Project.location),
@@ -99,7 +100,7 @@ class ProjectRepository:
             if search_query:
                 from ..db import search_projects_fts
 
-                project_ids = search_projects_fts(search_query)
+                project_ids = search_projects_fts(search_query, session=session)
                 if project_ids:
                     query = query.filter(Project.id.in_(project_ids))
                 else:
@@ -151,20 +152,18 @@ class ProjectRepository:
                 query = query.order_by(Project.modified_date.desc())
 
             return query.all()
-        finally:
-            session.close()
 
-    def get_by_id(self, project_id: int) -> Project | None:
+    def get_by_id(self, project_id: int, session: Session | None = None) -> Project | None:
         """Get a project by ID.
 
         Args:
             project_id: Project ID.
+            session: Optional open session to use; the caller commits and closes it.
 
         Returns:
             Project object or None.
         """
-        session = get_session()
-        try:
+        with session_scope(session) as session:
             return (
                 session.query(Project)
                 .options(
@@ -175,23 +174,19 @@ class ProjectRepository:
                 .filter(Project.id == project_id)
                 .first()
             )
-        finally:
-            session.close()
 
-    def count(self, location_id: int | None = None) -> int:
+    def count(self, location_id: int | None = None, session: Session | None = None) -> int:
         """Get project count.
 
         Args:
             location_id: Optional location filter.
+            session: Optional open session to use; the caller commits and closes it.
 
         Returns:
             Total count.
         """
-        session = get_session()
-        try:
+        with session_scope(session) as session:
             query = session.query(Project)
             if location_id:
                 query = query.filter(Project.location_id == location_id)
             return query.count()
-        finally:
-            session.close()
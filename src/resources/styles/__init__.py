@@ -1,21 +1,82 @@
 """Style configuration loader for Ableton Hub."""
 
 import json
+from collections.abc import Callable
+from functools import cache, lru_cache
 from pathlib import Path
 from typing import Any, cast
 
 
+@lru_cache(maxsize=1)
 def get_style_config() -> dict[str, Any]:
     """Load and return the style configuration.
 
+    The JSON file is read once per process; use reload_style_config()
+    to pick up edits made while the app is running.
+
     Returns:
         Dictionary containing all style configuration.
     """
     config_path = Path(__file__).parent / "style_config.json"
-    with open(config_path, encoding="utf-8") as f:
-        return cast(dict[str, Any], json.load(f))
+    # json.loads detects UTF-8 from raw bytes, skipping the text-mode decode layer
+    return cast(dict[str, Any], json.loads(config_path.read_bytes()))
+
+
+def reload_style_config() -> dict[str, Any]:
+    """Discard the cached style configuration and load it again from disk.
+
+    Returns:
+        Dictionary containing the freshly loaded style configuration.
+    """
+    get_style_config.cache_clear()
+    _get_flat_components.cache_clear()
+    get_color.cache_clear()
+    get_font_size.cache_clear()
+    get_spacing.cache_clear()
+    return get_style_config()
+
+
+def _flatten(tree: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flatten a nested style dict into dot-separated leaf paths."""
+    flat: dict[str, Any] = {}
+    for key, value in tree.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+@cache
+def _compile_path(property_path: str) -> Callable[[Any], Any]:
+    """Build a getter that walks a dot-separated path through nested style dicts.
+
+    The path is split once; the returned getter is reused for every later lookup.
+    """
+    parts = tuple(property_path.split("."))
+
+    def getter(value: Any) -> Any:
+        for part in parts:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part, {})
+        return value
+
+    return getter
+
+
+@lru_cache(maxsize=1)
+def _get_flat_components() -> dict[str, dict[str, Any]]:
+    """Return every component's leaf values keyed by their dotted property path."""
+    components = cast(dict[str, Any], get_style_config().get("components", {}))
+    return {
+        name: _flatten(style) if isinstance(style, dict) else {}
+        for name, style in components.items()
+    }
 
 
+@cache
 def get_color(category: str, name: str) -> str:
     """Get a color value from the style config.
 
@@ -32,6 +93,7 @@ def get_color(category: str, name: str) -> str:
     return cast(str, category_colors.get(name, ""))
 
 
+@cache
 def get_font_size(size_name: str) -> int:
     """Get a font size value.
 
@@ -47,6 +109,7 @@ def get_font_size(size_name: str) -> int:
     return cast(int, sizes.get(size_name, 12))
 
 
+@cache
 def get_spacing(spacing_name: str) -> int:
     """Get a spacing value.
 
@@ -76,13 +139,11 @@ def get_component_style(component: str, property_path: str | None = None) -> Any
     component_style = components.get(component, {})
 
     if property_path:
-        parts = property_path.split(".")
-        value = component_style
-        for part in parts:
-            if isinstance(value, dict):
-                value = value.get(part, {})
-            else:
-                return None
-        return value
+        flat_style = _get_flat_components().get(component)
+        if flat_style is not None and property_path in flat_style:
+            return flat_style[property_path]
+
+        # Subtree or missing path - walk the nested dict
+        return _compile_path(property_path)(component_style)
 
     return component_style
@@ -1,14 +1,15 @@
 """File system scanner for discovering Ableton projects."""
 
 import hashlib
-import json
 import os
+import re
 from datetime import datetime
 from pathlib import Path
 
 from PyQt6.QtCore import QObject, QThread, pyqtSignal
 
 from ..database import Export, Location, Project, ProjectStatus, get_session
+from ..database.db import bulk_load
 from ..utils.fuzzy_match import match_export_to_project, normalize_for_comparison
 from ..utils.logging import get_logger
 from ..utils.paths import is_ableton_project, normalize_path
@@ -38,6 +39,9 @@ class ScanWorker(QThread):
 
         self.location_ids = location_ids
         self.exclude_patterns = exclude_patterns or []
+        self._exclude_re, self._exclude_names = self._compile_exclude_patterns(
+            self.exclude_patterns
+        )
         self._stop_requested = False
         self._found_count = 0
         self._parse_metadata = parse_metadata
@@ -72,29 +76,31 @@ class ScanWorker(QThread):
 
                 self.logger.info(f"Starting scan of {len(locations)} location(s)")
 
-                # Scan each location
+                # Scan each location; the FTS index is rebuilt once at the end
+                # instead of being updated by a trigger for every project row
                 total_locations = len(locations)
-                for idx, location in enumerate(locations):
-                    if self._stop_requested:
-                        self.logger.info("Scan stopped by user")
-                        break
-
-                    self.progress.emit(idx, total_locations, f"Scanning {location.name}...")
-                    self.logger.info(f"Scanning location: {location.name} ({location.path})")
-                    try:
-                        self._scan_location(location, session)
-                        self.logger.info(
-                            f"Completed location: {location.name} - Found {self._found_count} new project(s) so far"
-                        )
-                    except Exception as e:
-                        self.logger.error(
-                            f"Error scanning location {location.name}: {e}", exc_info=True
-                        )
-                        self.error.emit(f"Error scanning {location.name}: {e}")
+                with bulk_load():
+                    for idx, location in enumerate(locations):
+                        if self._stop_requested:
+                            self.logger.info("Scan stopped by user")
+                            break
+
+                        self.progress.emit(idx, total_locations, f"Scanning {location.name}...")
+                        self.logger.info(f"Scanning location: {location.name} ({location.path})")
+                        try:
+                            self._scan_location(location, session)
+                            self.logger.info(
+                                f"Completed location: {location.name} - Found {self._found_count} new project(s) so far"
+                            )
+                        except Exception as e:
+                            self.logger.error(
+                                f"Error scanning location {location.name}: {e}", exc_info=True
+                            )
+                            self.error.emit(f"Error scanning {location.name}: {e}")
 
-                    # Update last scan time
-                    location.last_scan_time = datetime.utcnow()
-                    session.commit()
+                        # Update last scan time
+                        location.last_scan_time = datetime.utcnow()
+                        session.commit()
 
                 self.logger.info(f"Scan complete - Total new projects found: {self._found_count}")
                 self.scan_complete.emit(self._found_count)
@@ -353,7 +359,7 @@ class ScanWorker(QThread):
                 metadata, als_path, project.id
             )
             if feature_vector:
-                project.feature_vector = json.dumps(feature_vector)
+                project.feature_vector = feature_vector
 
         # Note: export_song_name is NOT auto-populated during scanning.
         # Users can manually set it via the Properties view or use the "Suggest" button.
@@ -529,6 +535,33 @@ class ScanWorker(QThread):
                 return True
         return False
 
+    @staticmethod
+    def _compile_exclude_patterns(
+        patterns: list[str],
+    ) -> tuple[re.Pattern[str] | None, frozenset[str]]:
+        """Precompile exclude patterns for _is_excluded.
+
+        Patterns containing "**" match when their remaining text appears anywhere in
+        the path; they are combined into a single regex. Other patterns match an
+        exact directory name.
+
+        Args:
+            patterns: Glob-style exclude patterns.
+
+        Returns:
+            Tuple of (combined substring regex or None, set of exact names).
+        """
+        substrings = []
+        names = set()
+        for pattern in patterns:
+            if "**" in pattern:
+                substrings.append(pattern.replace("**/", "").replace("**", "").strip("/"))
+            else:
+                names.add(pattern)
+
+        exclude_re = re.compile("|".join(map(re.escape, substrings))) if substrings else None
+        return exclude_re, frozenset(names)
+
     def _is_excluded(self, path: Path) -> bool:
         """Check if a path should be excluded from scanning.
 
@@ -538,27 +571,16 @@ class ScanWorker(QThread):
         Returns:
             True if the path should be excluded.
         """
-        path_str = str(path)
         name = path.name
 
         # Always exclude hidden directories
         if name.startswith("."):
             return True
 
-        # Check against exclude patterns
-        for pattern in self.exclude_patterns:
-            # Simple glob matching
-            if "**" in pattern:
-                pattern_part = pattern.replace("**/", "").replace("**", "")
-                if pattern_part.strip("/") in path_str:
-                    return True
-            elif pattern.startswith("**/"):
-                if name == pattern[3:]:
-                    return True
-            elif name == pattern:
-                return True
-
-        return False
+        # Check against the precompiled exclude patterns
+        if name in self._exclude_names:
+            return True
+        return self._exclude_re is not None and self._exclude_re.search(str(path)) is not None
 
     def stop(self) -> None:
         """Request the scan to stop."""
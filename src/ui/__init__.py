@@ -1,9 +1,24 @@
 """UI module - PyQt6 user interface components."""
 
-from .main_window import MainWindow
-from .theme import AbletonTheme
+from typing import Any
+
+# Resolved on first access so importing a single UI submodule (e.g. the theme)
+# does not pull in the whole main window widget tree.
+_LAZY_IMPORTS = {
+    "MainWindow": ".main_window",
+    "AbletonTheme": ".theme",
+}
 
 __all__ = [
     "MainWindow",
     "AbletonTheme",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import UI classes lazily (PEP 562)."""
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+
+        return getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
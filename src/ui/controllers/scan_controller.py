@@ -274,11 +274,11 @@ class ProjectRescanWorker(QThread):
             project: Project database object.
             metadata: ProjectMetadata object from parser.
         """
-        import json
         from datetime import datetime
 
-        project.plugins = json.dumps(metadata.plugins) if metadata.plugins else "[]"
-        project.devices = json.dumps(metadata.devices) if metadata.devices else "[]"
+        # Lists are assigned as-is; the JSON columns serialize them
+        project.plugins = metadata.plugins or []
+        project.devices = metadata.devices or []
         project.tempo = metadata.tempo
         project.time_signature = metadata.time_signature
         project.track_count = metadata.track_count
@@ -295,9 +295,7 @@ class ProjectRescanWorker(QThread):
         else:
             project.arrangement_duration_seconds = None
         project.ableton_version = metadata.ableton_version
-        project.sample_references = (
-            json.dumps(metadata.sample_references) if metadata.sample_references else "[]"
-        )
+        project.sample_references = metadata.sample_references or []
         project.has_automation = metadata.has_automation
         project.last_parsed = datetime.utcnow()
 
@@ -307,13 +305,9 @@ class ProjectRescanWorker(QThread):
         project.is_in_key = metadata.is_in_key
 
         # Timeline markers (extracted using dawtool)
-        project.timeline_markers = (
-            json.dumps(metadata.timeline_markers) if metadata.timeline_markers else "[]"
-        )
+        project.timeline_markers = metadata.timeline_markers or []
 
         # ALS project metadata
-        project.export_filenames = (
-            json.dumps(metadata.export_filenames) if metadata.export_filenames else None
-        )
+        project.export_filenames = metadata.export_filenames or None
         project.annotation = metadata.annotation
         project.master_track_name = metadata.master_track_name
@@ -386,16 +386,8 @@ class ProjectDetailsDialog(QDialog):
 
         info_parts = []
 
-        # Export filenames (stored as JSON in DB)
+        # Export filenames (decoded to a list by the JSONList column)
         export_filenames = self._project.export_filenames
-        if isinstance(export_filenames, str):
-            import json
-
-            try:
-                export_filenames = json.loads(export_filenames)
-            except (json.JSONDecodeError, TypeError):
-                export_filenames = []
-
         if export_filenames:
             info_parts.append(f"📁 Export names: {', '.join(export_filenames)}")
 
@@ -456,14 +448,6 @@ class ProjectDetailsDialog(QDialog):
 
         # Use stored DB metadata instead of re-parsing ALS file
         export_filenames = self._project.export_filenames
-        if isinstance(export_filenames, str):
-            import json
-
-            try:
-                export_filenames = json.loads(export_filenames)
-            except (json.JSONDecodeError, TypeError):
-                export_filenames = []
-
         if export_filenames:
             suggestion = export_filenames[0]
             source = "project export history"
@@ -101,10 +101,7 @@ class SettingsDialog(QDialog):
         self.theme_group = QButtonGroup(self)
         available_themes = AbletonTheme.get_available_themes()
 
-        # Get current theme (handle legacy "dark" theme)
-        current_theme = getattr(self.config.ui, "theme", "orange")
-        if current_theme == "dark":
-            current_theme = "orange"
+        current_theme = self.config.ui.theme
 
         # Map theme IDs to radio buttons
         self.theme_radios = {}
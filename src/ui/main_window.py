@@ -568,7 +568,7 @@ class MainWindow(QMainWindow):
 
                 from ..database.db import search_projects_fts
 
-                project_ids = search_projects_fts(search_query)
+                project_ids = search_projects_fts(search_query, session=session)
                 if project_ids:
                     query = query.filter(Project.id.in_(project_ids))
                 else:
@@ -893,16 +893,8 @@ class ProjectPropertiesView(QWidget):
 
         info_parts = []
 
-        # Export filenames (stored as JSON)
+        # Export filenames (decoded to a list by the JSONList column)
         export_filenames = self._project.export_filenames
-        if isinstance(export_filenames, str):
-            import json
-
-            try:
-                export_filenames = json.loads(export_filenames)
-            except (json.JSONDecodeError, TypeError):
-                export_filenames = []
-
         if export_filenames:
             info_parts.append(f"📁 Export names: {', '.join(export_filenames)}")
             # Store in als_metadata for suggest button
@@ -17,6 +17,7 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
+from sqlalchemy.orm import selectinload
 
 from ...database import Collection, Location, Tag, get_session
 from ...utils.logging import get_logger
@@ -1479,8 +1480,13 @@ class Sidebar(QWidget):
 
         session = get_session()
         try:
+            # Track counts come from project_collections, loaded for every
+            # collection in one query rather than one per sidebar item
             collections = (
-                session.query(Collection).order_by(Collection.sort_order, Collection.name).all()
+                session.query(Collection)
+                .options(selectinload(Collection.project_collections))
+                .order_by(Collection.sort_order, Collection.name)
+                .all()
             )
 
             for coll in collections:
@@ -1,6 +1,7 @@
 """Utilities module - Helper functions and cross-platform utilities."""
 
-from .fuzzy_match import calculate_similarity, fuzzy_match_projects
+from typing import Any
+
 from .paths import (
     get_app_data_dir,
     get_database_path,
@@ -8,6 +9,13 @@ from .paths import (
     normalize_path,
 )
 
+# fuzzy_match pulls in rapidfuzz, so its helpers are imported on first access;
+# every module that imports src.utils.logging or src.utils.paths would otherwise pay for it
+_LAZY_IMPORTS = {
+    "calculate_similarity": ".fuzzy_match",
+    "fuzzy_match_projects": ".fuzzy_match",
+}
+
 __all__ = [
     "get_default_locations",
     "normalize_path",
@@ -16,3 +24,12 @@ __all__ = [
     "fuzzy_match_projects",
     "calculate_similarity",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import heavy helpers lazily (PEP 562)."""
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+
+        return getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
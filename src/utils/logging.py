@@ -128,8 +128,14 @@ def setup_logging(
         max_bytes = config.max_bytes if config else 10 * 1024 * 1024  # 10MB
         backup_count = config.backup_count if config else 5
 
+        # delay=True: the files are only opened once a record is actually written,
+        # so startup at the default ERROR level doesn't open them at all
         file_handler = RotatingFileHandler(
-            str(main_log_path), maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            str(main_log_path),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+            delay=True,
         )
         file_handler.setLevel(log_level)
         file_handler.setFormatter(standard_formatter)
@@ -138,7 +144,11 @@ def setup_logging(
         # Error log file (ERROR and CRITICAL only)
         error_log_path = logs_dir / "ableton_hub_errors.log"
         error_handler = RotatingFileHandler(
-            str(error_log_path), maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            str(error_log_path),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+            delay=True,
         )
         error_handler.setLevel(logging.ERROR)  # Only ERROR and above
         error_handler.setFormatter(error_formatter)
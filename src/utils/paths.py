@@ -2,6 +2,7 @@
 
 import os
 import sys
+from functools import cache
 from pathlib import Path
 
 
@@ -154,10 +155,12 @@ def is_ableton_project(path: Path) -> bool:
     return path.is_file() and path.suffix.lower() == ".als"
 
 
+@cache
 def get_resources_path() -> Path:
     """Get the path to the resources directory.
 
-    Works both in development and when installed via pip.
+    Works both in development and when installed via pip. The location cannot
+    change while the app runs, so it is resolved once and cached.
 
     Returns:
         Path to the resources directory.
@@ -0,0 +1,82 @@
+"""Tests for configuration persistence."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from src.config import ConfigManager
+
+
+@pytest.fixture
+def config_path():
+    """Provide a path for a config file inside a temporary directory."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield Path(tmp_dir) / "config.json"
+
+
+class TestConfigManager:
+    """Tests for the ConfigManager class."""
+
+    def test_round_trip(self, config_path):
+        """Test that saved values are loaded back."""
+        manager = ConfigManager(config_path)
+        manager.config.ui.theme = "blue"
+        manager.config.window.width = 1234
+        manager.save()
+
+        loaded = ConfigManager(config_path).config
+        assert loaded.ui.theme == "blue"
+        assert loaded.window.width == 1234
+
+    def test_save_skips_unchanged_config(self, config_path):
+        """Test that saving an unmodified config does not rewrite the file."""
+        ConfigManager(config_path).save()
+        manager = ConfigManager(config_path)
+        manager.config.ui.theme = "green"
+        manager.save()
+
+        # Overwrite on disk behind the manager's back; an unchanged save must not touch it
+        config_path.write_text(json.dumps({"ui": {"theme": "pink"}}), encoding="utf-8")
+        manager.save()
+        assert json.loads(config_path.read_text(encoding="utf-8"))["ui"]["theme"] == "pink"
+
+        manager.config.ui.theme = "orange"
+        manager.save()
+        assert json.loads(config_path.read_text(encoding="utf-8"))["ui"]["theme"] == "orange"
+
+    def test_load_ignores_unknown_keys(self, config_path):
+        """Test that keys the dataclasses don't declare are skipped on load."""
+        config_path.write_text(
+            json.dumps({"ui": {"theme": "blue", "removed_option": 1}, "window": None}),
+            encoding="utf-8",
+        )
+
+        loaded = ConfigManager(config_path).config
+        assert loaded.ui.theme == "blue"
+        assert loaded.window.width == 1400
+
+    def test_legacy_dark_theme_maps_to_orange(self, config_path):
+        """Test that the legacy "dark" theme is normalized on load."""
+        config_path.write_text(json.dumps({"ui": {"theme": "dark"}}), encoding="utf-8")
+
+        assert ConfigManager(config_path).config.ui.theme == "orange"
+
+    def test_save_leaves_no_temp_file(self, config_path):
+        """Test that the atomic save replaces the config and cleans up after itself."""
+        manager = ConfigManager(config_path)
+        manager.config.ui.theme = "pink"
+        manager.save()
+
+        assert [p.name for p in config_path.parent.iterdir()] == ["config.json"]
+
+    def test_stdlib_serialization_matches_orjson(self, config_path, monkeypatch):
+        """Test that the stdlib fallback writes the same JSON document as orjson."""
+        pytest.importorskip("orjson")
+        manager = ConfigManager(config_path)
+        manager.config.scan.exclude_patterns.append("**/tmp/**")
+        fast = manager._serialize(manager.config)
+
+        monkeypatch.setattr("src.config.ORJSON_AVAILABLE", False)
+        assert json.loads(manager._serialize(manager.config)) == json.loads(fast)
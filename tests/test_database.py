@@ -5,12 +5,17 @@ from pathlib import Path
 from datetime import datetime
 import tempfile
 
-from src.database.db import get_engine, init_database, session_scope, close_database
+from sqlalchemy import text
+
+from src.database.db import (
+    get_engine, init_database, session_scope, close_database, search_projects_fts, bulk_load
+)
 from src.database.models import (
     Base, Project, Location, Collection, Tag,
     ProjectCollection, Export, LinkDevice,
     LocationType, ProjectStatus, CollectionType
 )
+from src.database.repositories import CollectionRepository, LocationRepository
 
 
 @pytest.fixture
@@ -64,6 +69,74 @@ class TestLocationModel:
                 assert loc is not None
 
 
+class TestLocationRepository:
+    """Tests for LocationRepository."""
+
+    def test_delete_with_projects_keeps_collection_tracks(self, temp_db):
+        """Test that only projects outside collections are deleted with a location."""
+        with session_scope() as session:
+            location = Location(name="Old Drive", path="/old")
+            collection = Collection(name="Album", collection_type=CollectionType.ALBUM)
+            kept = Project(name="Kept", file_path="/old/kept.als", location=location)
+            dropped = Project(name="Dropped", file_path="/old/dropped.als", location=location)
+            dropped.exports.append(Export(export_path="/old/dropped.wav", export_name="dropped"))
+            session.add_all([location, collection, kept, dropped])
+            session.add(ProjectCollection(project=kept, collection=collection, track_number=1))
+            session.flush()
+            location_id = location.id
+
+        assert LocationRepository().delete(location_id, delete_projects=True)
+
+        with session_scope() as session:
+            assert session.query(Location).count() == 0
+            projects = session.query(Project).all()
+            assert [(p.name, p.location_id) for p in projects] == [("Kept", None)]
+            assert session.query(Export).count() == 0
+
+    def test_delete_on_shared_session_with_loaded_projects(self, temp_db):
+        """Test that projects already loaded on a passed-in session aren't cascaded away."""
+        with session_scope() as session:
+            location = Location(name="Old Drive", path="/old")
+            collection = Collection(name="Album", collection_type=CollectionType.ALBUM)
+            kept = Project(name="Kept", file_path="/old/kept.als", location=location)
+            dropped = Project(name="Dropped", file_path="/old/dropped.als", location=location)
+            session.add_all([location, collection, kept, dropped])
+            session.add(ProjectCollection(project=kept, collection=collection, track_number=1))
+            session.flush()
+            location_id = location.id
+
+        repository = LocationRepository()
+        with session_scope() as session:
+            location = repository.get_by_id(location_id, session=session)
+            assert len(location.projects) == 2
+            assert repository.delete(location_id, delete_projects=True, session=session)
+
+        with session_scope() as session:
+            projects = session.query(Project).all()
+            assert [(p.name, p.location_id) for p in projects] == [("Kept", None)]
+
+
+class TestSessionScope:
+    """Tests for session_scope()."""
+
+    def test_existing_session_is_left_to_the_caller(self, temp_db):
+        """Test that a passed-in session is neither committed nor closed."""
+        with session_scope() as session:
+            session.add(Location(name="Shared", path="/shared"))
+            session.flush()
+
+            with session_scope(session) as inner:
+                assert inner is session
+                location = LocationRepository().get_all(session=session)[0]
+
+            # Same identity map, and the insert is still uncommitted
+            assert location in session
+            session.rollback()
+
+        with session_scope() as session:
+            assert session.query(Location).count() == 0
+
+
 class TestProjectModel:
     """Tests for the Project model."""
     
@@ -89,6 +162,48 @@ class TestProjectModel:
             assert proj.file_size == 1024
             assert proj.status == ProjectStatus.LOCAL
     
+    def test_json_lists_decode_double_encoded_rows(self, temp_db):
+        """Test that list columns stored as JSON strings by older scans load as lists."""
+        with session_scope() as session:
+            session.execute(text(
+                "INSERT INTO projects (name, file_path, plugins, feature_vector) "
+                """VALUES ('Old Scan', '/test/old.als', '"[\\"Serum\\"]"', '"[0.5]"')"""
+            ))
+
+        with session_scope() as session:
+            proj = session.query(Project).filter(Project.name == "Old Scan").first()
+            assert proj.plugins == ["Serum"]
+            assert proj.get_feature_vector_list() == [0.5]
+
+    def test_json_list_text_is_stored_once_encoded(self, temp_db):
+        """Test that JSON text assigned to a list column is stored as the list."""
+        with session_scope() as session:
+            session.add(Project(name="Text", file_path="/test/text.als", devices='["Reverb"]'))
+
+        with session_scope() as session:
+            stored = session.execute(
+                text("SELECT devices FROM projects WHERE name = 'Text'")
+            ).scalar()
+            assert stored == '["Reverb"]'
+
+    def test_json_list_malformed_text_loads_as_empty(self, temp_db):
+        """Test that non-JSON list text loads as empty and assigned text is stored as given."""
+        with session_scope() as session:
+            session.execute(text(
+                "INSERT INTO projects (name, file_path, plugins) "
+                """VALUES ('Bad Row', '/test/bad.als', '"Serum, Massive"')"""
+            ))
+            session.add(Project(name="Bad Text", file_path="/test/text.als", devices="Reverb, Delay"))
+
+        with session_scope() as session:
+            projects = {p.name: p for p in session.query(Project).all()}
+            assert projects["Bad Row"].get_plugins_list() == []
+            assert projects["Bad Text"].get_devices_list() == []
+            stored = session.execute(
+                text("SELECT devices FROM projects WHERE name = 'Bad Text'")
+            ).scalar()
+            assert stored == '"Reverb, Delay"'
+
     def test_project_tags_json(self, temp_db):
         """Test storing tags as JSON."""
         with session_scope() as session:
@@ -143,6 +258,23 @@ class TestCollectionModel:
             assert len(coll.project_collections) == 1
             assert coll.projects[0].name == "Track 1"
 
+    def test_get_with_projects_loads_tracks(self, temp_db):
+        """Test that the repository loads a collection's projects in track order."""
+        with session_scope() as session:
+            collection = Collection(name="EP", collection_type=CollectionType.EP)
+            session.add(collection)
+            for track_number, name in [(2, "Second"), (1, "First")]:
+                project = Project(name=name, file_path=f"/test/{name}.als")
+                session.add(ProjectCollection(
+                    project=project, collection=collection, track_number=track_number
+                ))
+            session.flush()
+            collection_id = collection.id
+
+        coll = CollectionRepository().get_with_projects(collection_id)
+        # Detached from its closed session, so anything not loaded would raise
+        assert [project.name for project in coll.projects] == ["First", "Second"]
+
 
 class TestTagModel:
     """Tests for the Tag model."""
@@ -211,3 +343,77 @@ class TestLinkDeviceModel:
             assert dev is not None
             assert dev.ip_address == "192.168.1.100"
             assert dev.is_active is True
+
+
+class TestProjectSearch:
+    """Tests for full-text project search."""
+
+    def test_prefix_search(self, temp_db):
+        """Test that search matches name prefixes."""
+        with session_scope() as session:
+            session.add(Project(name="Midnight Groove", file_path="/test/groove.als"))
+            session.add(Project(name="Sunrise", file_path="/test/sunrise.als"))
+
+        with session_scope() as session:
+            groove_id = session.query(Project.id).filter(
+                Project.name == "Midnight Groove"
+            ).scalar()
+
+        assert search_projects_fts("midn") == [groove_id]
+        assert search_projects_fts("nothing") == []
+
+    def test_quotes_in_query(self, temp_db):
+        """Test that double quotes in the query are escaped, not parsed."""
+        with session_scope() as session:
+            session.add(Project(name='The "Big" Mix', file_path="/test/big.als"))
+
+        assert len(search_projects_fts('"Big"')) == 1
+
+    def test_bulk_load_rebuilds_index(self, temp_db):
+        """Test that rows written inside bulk_load() are searchable afterwards."""
+        with bulk_load():
+            with session_scope() as session:
+                session.add(Project(name="Bulk Track", file_path="/test/bulk.als"))
+
+        assert len(search_projects_fts("bulk")) == 1
+
+        # Triggers are back: later writes are indexed immediately
+        with session_scope() as session:
+            session.add(Project(name="Bulky Sequel", file_path="/test/bulky.als"))
+
+        assert len(search_projects_fts("bulk")) == 2
+
+    def test_search_on_caller_session(self, temp_db):
+        """Test that a search can run on the caller's session."""
+        with session_scope() as session:
+            session.add(Project(name="Session Jam", file_path="/test/jam.als"))
+
+        with session_scope() as session:
+            assert len(search_projects_fts("jam", session=session)) == 1
+
+    def test_search_does_not_flush_pending_objects(self, temp_db):
+        """Test that searching on a session leaves its pending objects alone."""
+        with session_scope() as session:
+            session.add(Project(name="Pending Jam", file_path="/test/pending.als"))
+            assert search_projects_fts("pending", session=session) == []
+            assert len(session.new) == 1
+
+    def test_single_word_and_keyword_queries(self, temp_db):
+        """Test bare-word prefix queries and words FTS5 treats as operators."""
+        with session_scope() as session:
+            session.add(Project(name="Or Not Mix", file_path="/test/ornot.als"))
+            session.add(Project(name="Café Session", file_path="/test/cafe.als"))
+
+        assert len(search_projects_fts("caf")) == 1
+        assert len(search_projects_fts("NOT")) == 1
+        assert len(search_projects_fts("or not")) == 1
+        assert len(search_projects_fts("mix-")) == 1  # Punctuation falls back to a phrase
+
+    def test_fts_syntax_characters_are_literal(self, temp_db):
+        """Test that FTS5 operator characters in the query don't raise."""
+        with session_scope() as session:
+            session.add(Project(name="Loop (v2)", file_path="/test/loop.als"))
+
+        for query in ["loop (", "loop*", "^loop", "loop -v2", "loop:", 'loop "v2']:
+            search_projects_fts(query)
+        assert len(search_projects_fts("loop (v2")) == 1
@@ -0,0 +1,307 @@
+"""Tests for database schema migrations."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from src.database import migrations
+from src.database.migrations import MIGRATIONS, get_schema_version, run_migrations
+
+# Schema of a database created before schema versioning was introduced
+_LEGACY_SCHEMA = [
+    """
+    CREATE TABLE projects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(255) NOT NULL,
+        file_path VARCHAR(1024) NOT NULL UNIQUE,
+        location_id INTEGER,
+        status VARCHAR(20),
+        is_favorite BOOLEAN DEFAULT 0,
+        rating INTEGER,
+        export_song_name VARCHAR(255),
+        notes TEXT,
+        tags TEXT DEFAULT '[]',
+        created_date DATETIME,
+        modified_date DATETIME
+    )
+    """,
+    """
+    CREATE TABLE collections (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(255) NOT NULL,
+        collection_type VARCHAR(20)
+    )
+    """,
+    """
+    CREATE TABLE project_collections (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+        collection_id INTEGER NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+        track_number INTEGER
+    )
+    """,
+    """
+    CREATE TABLE exports (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER REFERENCES projects(id),
+        export_path VARCHAR(1024) NOT NULL,
+        export_date DATETIME,
+        created_date DATETIME
+    )
+    """,
+    "CREATE TABLE tags (id INTEGER PRIMARY KEY AUTOINCREMENT, name VARCHAR(100) NOT NULL)",
+    """
+    CREATE VIRTUAL TABLE projects_fts USING fts5(
+        name, export_song_name, notes, tags, content='projects', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER projects_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, name, export_song_name, notes, tags)
+        VALUES (new.id, new.name, new.export_song_name, new.notes, new.tags);
+    END
+    """,
+]
+
+_LEGACY_DATA = [
+    "INSERT INTO tags (id, name) VALUES (1, 'drums'), (2, 'vocals')",
+    "INSERT INTO projects (id, name, file_path, tags) VALUES (1, 'Night Drive', '/a.als', '[1, 2]')",
+    "INSERT INTO projects (id, name, file_path, tags) VALUES (2, 'Broken', '/b.als', 'not json')",
+    "INSERT INTO projects (id, name, file_path, tags) VALUES (3, 'Ghost', '/c.als', '[1, 99]')",
+    """
+    INSERT INTO exports (id, project_id, export_path, created_date) VALUES
+        (1, 1, '/a.wav', '2024-01-02'),
+        (2, 1, '/a.wav', '2024-01-01'),
+        (3, 1, '/b.wav', '2024-01-01')
+    """,
+    "INSERT INTO collections (id, name) VALUES (1, 'Album')",
+    """
+    INSERT INTO project_collections (project_id, collection_id, track_number)
+    VALUES (1, 1, 1)
+    """,
+]
+
+
+@pytest.fixture
+def legacy_engine():
+    """Provide an engine on a database with the pre-versioning schema and some rows."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'legacy.db'}")
+        with engine.begin() as conn:
+            for statement in _LEGACY_SCHEMA + _LEGACY_DATA:
+                conn.execute(text(statement))
+        yield engine
+        engine.dispose()
+
+
+def _columns(engine, table):
+    with engine.connect() as conn:
+        return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+class TestRunMigrations:
+    """Tests for upgrading a legacy database to the latest schema."""
+
+    def test_upgrades_to_latest_version(self, legacy_engine):
+        """Test that every migration is applied and recorded."""
+        run_migrations(legacy_engine)
+
+        assert get_schema_version(legacy_engine) == MIGRATIONS[-1][0]
+        project_columns = _columns(legacy_engine, "projects")
+        for column in ("file_hash", "plugins", "tempo", "musical_key", "feature_vector"):
+            assert column in project_columns
+        assert "track_name" in _columns(legacy_engine, "project_collections")
+        assert "artist_name" in _columns(legacy_engine, "collections")
+
+    def test_every_listed_column_is_added(self, legacy_engine):
+        """Test that the upgrade adds each column in the column migration table."""
+        run_migrations(legacy_engine)
+
+        for additions in migrations._COLUMN_ADDS.values():
+            for table, name, _definition in additions:
+                assert name in _columns(legacy_engine, table)
+
+    def test_running_twice_is_a_no_op(self, legacy_engine):
+        """Test that a second run leaves an up-to-date database alone."""
+        run_migrations(legacy_engine)
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as conn:
+            versions = conn.execute(text("SELECT count(*) FROM schema_version")).scalar()
+        assert versions == len(MIGRATIONS) + 1  # Plus the initial version 1 row
+
+    def test_up_to_date_engine_is_skipped(self, legacy_engine):
+        """Test that later runs on a migrated engine issue no queries."""
+        run_migrations(legacy_engine)
+
+        statements = []
+        event.listen(
+            legacy_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        run_migrations(legacy_engine)
+        assert statements == []
+
+    def test_failed_upgrade_is_rolled_back(self, legacy_engine, monkeypatch):
+        """Test that a failing migration undoes the ones that ran before it."""
+
+        def fail(conn, schema):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(migrations, "MIGRATIONS", MIGRATIONS + [(999, "Fail", fail)])
+        with pytest.raises(RuntimeError):
+            run_migrations(legacy_engine)
+
+        assert get_schema_version(legacy_engine) == 1
+        assert "file_hash" not in _columns(legacy_engine, "projects")
+
+    def test_standalone_migration_reads_tables_in_one_query(self, legacy_engine):
+        """Test that a migration called without a snapshot reads its tables together."""
+        statements = []
+        event.listen(
+            legacy_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        with legacy_engine.begin() as conn:
+            migrations.migration_add_phase_25_fields(conn)
+
+        assert sum("pragma_table_info" in statement for statement in statements) == 1
+        assert "smart_rules" in _columns(legacy_engine, "collections")
+
+    def test_connection_settings_are_restored(self, legacy_engine):
+        """Test that the upgrade's PRAGMA settings don't leak into the pool."""
+        pragmas = ("foreign_keys", "temp_store", "cache_size")
+
+        def read_pragmas():
+            with legacy_engine.connect() as conn:
+                return [conn.exec_driver_sql(f"PRAGMA {name}").scalar() for name in pragmas]
+
+        before = read_pragmas()
+        run_migrations(legacy_engine)
+        assert read_pragmas() == before
+
+    def test_reads_each_table_schema_once(self, legacy_engine):
+        """Test that migrations share one column snapshot per table."""
+        statements = []
+        event.listen(
+            legacy_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        run_migrations(legacy_engine)
+
+        for table in ("projects", "collections", "project_collections", "projects_fts"):
+            assert (
+                sum(f"pragma_table_info('{table}')" in statement for statement in statements) == 1
+            )
+
+    def test_late_migrations_skip_schema_reads(self, legacy_engine, monkeypatch):
+        """Test that tables are only read when a pending migration checks them."""
+        run_migrations(legacy_engine)
+        with legacy_engine.begin() as conn:
+            conn.execute(text("DELETE FROM schema_version WHERE version > 19"))
+        monkeypatch.setattr(migrations, "_up_to_date_engines", set())
+
+        statements = []
+        event.listen(
+            legacy_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        run_migrations(legacy_engine)
+
+        assert get_schema_version(legacy_engine) == MIGRATIONS[-1][0]
+        assert not any("pragma_table_info" in statement for statement in statements)
+
+    def test_composite_indexes_are_all_or_nothing(self, legacy_engine):
+        """Test that one uncreatable index drops the others instead of failing."""
+        with legacy_engine.begin() as conn:
+            conn.execute(text("ALTER TABLE projects DROP COLUMN rating"))
+
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as conn:
+            index = conn.execute(
+                text("SELECT name FROM sqlite_master WHERE name = 'idx_project_location_status'")
+            ).first()
+        assert index is None
+        assert get_schema_version(legacy_engine) == MIGRATIONS[-1][0]
+
+    def test_partial_indexes_created_when_composite_indexes_skipped(self, legacy_engine):
+        """Test that migration 22 creates the favorites index migration 13 skipped."""
+        with legacy_engine.begin() as conn:
+            conn.execute(text("ALTER TABLE projects DROP COLUMN rating"))
+
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as conn:
+            sql = conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE name = 'idx_project_favorite_modified'")
+            ).scalar()
+        assert sql is not None and "WHERE is_favorite = 1" in sql
+
+    def test_tags_are_backfilled(self, legacy_engine):
+        """Test that JSON tag lists are copied into project_tags."""
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT project_id, tag_id FROM project_tags ORDER BY project_id, tag_id")
+            ).all()
+        # Invalid JSON and unknown tag ids are skipped
+        assert [tuple(row) for row in rows] == [(1, 1), (1, 2), (3, 1)]
+
+    def test_tags_are_backfilled_into_existing_table(self, legacy_engine):
+        """Test the backfill when create_all() made project_tags before the upgrade."""
+        with legacy_engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE project_tags (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    project_id INTEGER NOT NULL,
+                    tag_id INTEGER NOT NULL,
+                    created_date DATETIME,
+                    UNIQUE(project_id, tag_id)
+                )
+            """))
+            conn.execute(text("INSERT INTO project_tags (project_id, tag_id) VALUES (1, 1)"))
+
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as conn:
+            count = conn.execute(text("SELECT count(*) FROM project_tags")).scalar()
+        assert count == 3
+
+    def test_duplicate_exports_are_merged(self, legacy_engine):
+        """Test that the oldest export is kept for each duplicated path."""
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as conn:
+            ids = conn.execute(text("SELECT id FROM exports ORDER BY id")).scalars().all()
+        assert ids == [2, 3]
+
+    def test_favorite_index_is_partial(self, legacy_engine):
+        """Test that the favorites filter is served by the partial index."""
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as conn:
+            plan = conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT id FROM projects WHERE is_favorite = 1 "
+                "ORDER BY modified_date DESC"
+            ).all()
+        assert "idx_project_favorite_modified" in plan[0][-1]
+        assert "TEMP B-TREE" not in " ".join(row[-1] for row in plan)
+
+    def test_fts_index_covers_existing_projects(self, legacy_engine):
+        """Test that the recreated FTS table indexes rows written before the upgrade."""
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as conn:
+            assert "plugins" in _columns(legacy_engine, "projects_fts")
+            matches = conn.execute(
+                text("SELECT rowid FROM projects_fts WHERE projects_fts MATCH 'ghost'")
+            ).scalars()
+            assert list(matches) == [3]
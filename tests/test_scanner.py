@@ -84,6 +84,15 @@ class TestScanWorker:
         # Test regular folder is not excluded
         assert worker._is_excluded(Path("/some/path/Projects")) is False
     
+    def test_exact_name_and_multiple_patterns(self):
+        """Test plain names and several ** patterns are matched together."""
+        worker = ScanWorker(exclude_patterns=["**/Backup/**", "**/node_modules/**", "Samples"])
+
+        assert worker._is_excluded(Path("/some/node_modules/pkg")) is True
+        assert worker._is_excluded(Path("/some/path/Samples")) is True
+        assert worker._is_excluded(Path("/some/Samples Processed")) is False
+        assert worker._is_excluded(Path("/some/path/Projects")) is False
+    
     def test_hidden_folders_excluded(self):
         """Test that hidden folders are excluded."""
         worker = ScanWorker()